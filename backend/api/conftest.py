@@ -1,17 +1,23 @@
-from collections.abc import Generator
+import os
+from collections.abc import Callable, Generator
 from datetime import date
+from pathlib import Path
 
 import pytest
-from api.dependencies import (get_db, get_events_extraction_service,
+from api.dependencies import (get_db, get_events_extraction_service_factory,
                               get_storage, get_text_extraction_service)
 from api.main import app
+from api.repositories.events_repository import events_count_cache
 from api.services.baml_client.types import AlertType, MedicalAlert
+from api.services.event_types_cache import event_types_cache
 from api.services.events_extraction_service import EventsExtractionService
 from db.models.base import Base
 from db.models.event_type import EventType
-from db.session_creator import get_db_session
+from db.session_creator import (TEST_DB_PATH, dispose_engines,
+                                get_async_engine, get_db_session)
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 DEFAULT_EVENT_TYPES: tuple[tuple[str, str, str, bool], ...] = (
@@ -59,6 +65,18 @@ def _seed_default_event_types(session: Session) -> None:
         session.commit()
 
 
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    if item.get_closest_marker("postgres") and not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _remove_test_database() -> Generator[None, None, None]:
+    yield
+    dispose_engines()
+    Path(TEST_DB_PATH).unlink(missing_ok=True)
+
+
 @pytest.fixture
 def db_session() -> Generator[Session, None, None]:
     session = get_db_session(create_metadata=True, pool_size=None)
@@ -66,20 +84,51 @@ def db_session() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=session.bind)
         Base.metadata.create_all(bind=session.bind)
         _seed_default_event_types(session)
+        event_types_cache.invalidate()
         yield session
     finally:
         session.rollback()
         session.close()
 
 
-class StubEventsExtractionService(EventsExtractionService):
-    def __init__(self) -> None:
-        super().__init__(session=None)
+class StatementCounter:
+    """Counts SQL statements sent through `engines` while the block runs."""
+
+    def __init__(self, *engines: Engine) -> None:
+        self.engines = engines
+        self.count = 0
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
 
-    def extract_events(
-        self, text: str, event_types: list[EventType]
+
+@pytest.fixture
+def count_statements(db_session: Session) -> Callable[[], StatementCounter]:
+    return lambda: StatementCounter(
+        db_session.get_bind(), get_async_engine().sync_engine
+    )
+
+
+class StubEventsExtractionService(EventsExtractionService):
+    def __init__(self, session: Session | None = None) -> None:
+        super().__init__(session=session)
+
+    async def extract_events(
+        self,
+        text: str,
+        alert_types: list[AlertType],
+        on_alert: Callable[[MedicalAlert], None] | None = None,
     ) -> list[MedicalAlert]:
-        return [
+        alerts = [
             MedicalAlert(
                 type=AlertType(
                     id="vaccine_expirations",
@@ -90,17 +139,31 @@ class StubEventsExtractionService(EventsExtractionService):
                 date=date.today().isoformat(),
             )
         ]
+        if on_alert:
+            for alert in alerts:
+                on_alert(alert)
+        return alerts
 
 
 class StubStorage:
-    def put_file(
-        self, key: str, data: bytes, content_type: str = "application/octet-stream"
+    def put_path(
+        self, key: str, path: Path, content_type: str = "application/octet-stream"
     ) -> None:
         return None
 
+    def remove_object(self, key: str) -> None:
+        return None
+
+    def remove_objects(self, keys: list[str]) -> list[str]:
+        return []
+
 
 class StubTextExtractionService:
-    def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
+    async def extract_text_from_pdf(
+        self, pdf_path: Path, on_page: Callable[[int, int], None] | None = None
+    ) -> str:
+        if on_page:
+            on_page(1, 1)
         return "sample text"
 
 
@@ -111,12 +174,13 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
 
     dependency_overrides = {
         get_storage: lambda: StubStorage(),
-        get_events_extraction_service: lambda: StubEventsExtractionService(),
+        get_events_extraction_service_factory: lambda: StubEventsExtractionService,
         get_text_extraction_service: lambda: StubTextExtractionService(),
         get_db: _override_db,
     }
 
     app.dependency_overrides.update(dependency_overrides)
+    events_count_cache.clear()
     test_client = TestClient(app)
     try:
         yield test_client
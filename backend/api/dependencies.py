@@ -1,38 +1,84 @@
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator
 
-from api.repositories.event_types_repository import EventTypesRepository
-from api.repositories.events_repository import EventsRepository
-from api.repositories.medical_records_repository import \
-    MedicalRecordsRepository
+from api.repositories.event_types_repository import AsyncEventTypesRepository
+from api.repositories.events_repository import AsyncEventsRepository
+from api.repositories.extracted_texts_repository import \
+    ExtractedTextsRepository
+from api.repositories.extraction_results_repository import \
+    ExtractionResultsRepository
+from api.repositories.medical_records_repository import (
+    AsyncMedicalRecordsRepository, MedicalRecordsRepository)
 from api.services.events_extraction_service import (
     BamlEventsExtractionService, EventsExtractionService)
+from api.services.extraction_cache_service import ExtractionCacheService
+from api.services.ingestion_jobs_service import (
+    IngestionJobsService, MedicalRecordsRepositoryFactory)
 from api.services.text_extraction_service import (TextExtractionService,
                                                   get_text_extraction_service)
-from db.session_creator import get_db_session
+from db.session_creator import get_async_session_maker, get_session_maker
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from utils.settings import AppSettings
-from utils.storage import MinioClient
+from utils.storage import MinioClient, get_storage_client
 
 settings = AppSettings()
 
+ingestion_jobs_service = IngestionJobsService(
+    max_concurrent_jobs=settings.INGESTION_MAX_CONCURRENT_JOBS
+)
 
-def get_storage():
-    return MinioClient.from_env(settings=settings)
 
+def get_storage() -> MinioClient:
+    return get_storage_client(settings)
 
-def get_db() -> Generator[Session, None, None]:
-    db = get_db_session(pool_size=10)
+
+def get_session_factory() -> sessionmaker[Session]:
+    return get_session_maker()
+
+
+def get_db(
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+) -> Generator[Session, None, None]:
+    db = session_factory()
     try:
         yield db
     finally:
         db.close()
 
 
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return get_async_session_maker()
+
+
+async def get_async_db(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+) -> AsyncGenerator[AsyncSession, None]:
+    async with session_factory() as db:
+        yield db
+
+
+def get_events_extraction_service_factory() -> Callable[
+    [Session], EventsExtractionService
+]:
+    return BamlEventsExtractionService
+
+
 def get_events_extraction_service(
     session: Session = Depends(get_db),
+    events_extraction_service_factory: Callable[
+        [Session], EventsExtractionService
+    ] = Depends(get_events_extraction_service_factory),
 ) -> EventsExtractionService:
-    return BamlEventsExtractionService(session=session)
+    return events_extraction_service_factory(session)
+
+
+def get_extracted_texts_repository(
+    session: Session = Depends(get_db),
+) -> ExtractedTextsRepository:
+    return ExtractedTextsRepository(session=session)
 
 
 def get_medical_records_repository(
@@ -42,22 +88,66 @@ def get_medical_records_repository(
     events_extraction_service: EventsExtractionService = Depends(
         get_events_extraction_service
     ),
+    extracted_texts_repository: ExtractedTextsRepository = Depends(
+        get_extracted_texts_repository
+    ),
     storage: MinioClient = Depends(get_storage),
     session: Session = Depends(get_db),
 ) -> MedicalRecordsRepository:
     return MedicalRecordsRepository(
         text_extraction_service=text_extraction_service,
         events_extraction_service=events_extraction_service,
+        extracted_texts_repository=extracted_texts_repository,
         storage=storage,
         session=session,
     )
 
 
-def get_event_types_repository(
+def get_async_medical_records_repository(
+    storage: MinioClient = Depends(get_storage),
+    session: AsyncSession = Depends(get_async_db),
+) -> AsyncMedicalRecordsRepository:
+    return AsyncMedicalRecordsRepository(storage=storage, session=session)
+
+
+def get_medical_records_repository_factory(
+    text_extraction_service: TextExtractionService = Depends(
+        get_text_extraction_service
+    ),
+    events_extraction_service_factory: Callable[
+        [Session], EventsExtractionService
+    ] = Depends(get_events_extraction_service_factory),
+    storage: MinioClient = Depends(get_storage),
+) -> MedicalRecordsRepositoryFactory:
+    def build_repository(session: Session) -> MedicalRecordsRepository:
+        return MedicalRecordsRepository(
+            text_extraction_service=text_extraction_service,
+            events_extraction_service=events_extraction_service_factory(session),
+            extracted_texts_repository=ExtractedTextsRepository(session=session),
+            storage=storage,
+            session=session,
+        )
+
+    return build_repository
+
+
+def get_extraction_cache_service(
     session: Session = Depends(get_db),
-) -> EventTypesRepository:
-    return EventTypesRepository(session=session)
+) -> ExtractionCacheService:
+    return ExtractionCacheService(ExtractionResultsRepository(session=session))
+
+
+def get_ingestion_jobs_service() -> IngestionJobsService:
+    return ingestion_jobs_service
+
+
+def get_event_types_repository(
+    session: AsyncSession = Depends(get_async_db),
+) -> AsyncEventTypesRepository:
+    return AsyncEventTypesRepository(session=session)
 
 
-def get_events_repository(session: Session = Depends(get_db)) -> EventsRepository:
-    return EventsRepository(session=session)
+def get_events_repository(
+    session: AsyncSession = Depends(get_async_db),
+) -> AsyncEventsRepository:
+    return AsyncEventsRepository(session=session)
@@ -1,18 +1,72 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from api.dependencies import settings
 from api.error_handlers import (configure_exception_handlers,
                                 configure_middlewares)
 from api.routers.event_types_router import router as event_types_router
 from api.routers.events_router import router as events_router
+from api.routers.extraction_cache_router import \
+    router as extraction_cache_router
 from api.routers.medical_records_router import router as medical_records_router
+from api.routers.metrics_router import router as metrics_router
+from api.services.storage_sweeper import OrphanedObjectsSweeper
+from api.services.text_extraction_service import shutdown_ocr_executor
+from db.session_creator import (dispose_async_engines, dispose_engines,
+                                get_async_session_maker, init_async_engine,
+                                init_engine)
 from fastapi import FastAPI
+from utils.storage import close_storage, init_storage
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    init_engine(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    init_async_engine(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    storage = init_storage(settings)
+    sweeper_task = None
+    if settings.STORAGE_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = OrphanedObjectsSweeper(
+            storage=storage,
+            session_factory=get_async_session_maker(),
+            page_size=settings.STORAGE_SWEEP_PAGE_SIZE,
+            min_age_seconds=settings.STORAGE_SWEEP_MIN_AGE_SECONDS,
+        )
+        sweeper_task = asyncio.create_task(
+            sweeper.run(settings.STORAGE_SWEEP_INTERVAL_SECONDS)
+        )
+    try:
+        yield
+    finally:
+        if sweeper_task is not None:
+            sweeper_task.cancel()
+            await asyncio.gather(sweeper_task, return_exceptions=True)
+        shutdown_ocr_executor()
+        close_storage()
+        dispose_engines()
+        await dispose_async_engines()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     configure_middlewares(app)
     configure_exception_handlers(app)
     app.include_router(event_types_router)
     app.include_router(events_router)
     app.include_router(medical_records_router)
+    app.include_router(extraction_cache_router)
+    app.include_router(metrics_router)
     return app
 
 
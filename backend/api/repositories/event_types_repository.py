@@ -1,53 +1,58 @@
 from api.error_handlers import InvalidRequest
+from api.repositories.events_repository import (delete_events,
+                                                events_count_cache)
 from api.schemas import EventType as EventTypeSchema
+from api.services.event_types_cache import event_types_cache
 from db.models.event import Event
 from db.models.event_type import EventType
-from sqlalchemy.orm import Session
+from sqlalchemy import Delete, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-class EventTypesRepository:
+class AsyncEventTypesRepository:
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
     ):
         self.session = session
 
-    def get_event_types(self) -> list[EventTypeSchema]:
-        event_types: list[EventType] = self.session.query(EventType).all()
-        return [
-            EventTypeSchema(
-                id=event_type.id,
-                name=event_type.name,
-                description=event_type.description,
-                is_deletable=event_type.is_deletable,
-            )
-            for event_type in event_types
-        ]
-
-    def delete_event_type(self, event_type_id: str) -> None:
-        events: list[Event] = (
-            self.session.query(Event).filter(Event.event_type_id == event_type_id).all()
-        )
-        for event in events:
-            self.session.delete(event)
+    async def get_event_types(self) -> list[EventTypeSchema]:
+        snapshot = await event_types_cache.get_async(self.session)
+        return list(snapshot.event_types.values())
 
-        event_type: EventType | None = (
-            self.session.query(EventType).filter(EventType.id == event_type_id).first()
+    async def delete_event_type(self, event_type_id: str) -> None:
+        event_type: EventType | None = await self.session.scalar(
+            select(EventType).where(EventType.id == event_type_id)
         )
         if not event_type:
             raise InvalidRequest(f"Event type {event_type_id} not found")
         if not event_type.is_deletable:
             raise InvalidRequest(f"Event type {event_type.name} is not deletable")
-        self.session.delete(event_type)
-        self.session.commit()
 
-    def create_event_type(self, name: str, description: str) -> EventTypeSchema:
+        # Events go first in bounded batches; the ON DELETE CASCADE on
+        # events.event_type_id catches any inserted in the meantime.
+        await delete_events(self.session, Event.event_type_id == event_type_id)
+        await self.session.execute(_delete_event_type(event_type_id))
+        await self.session.commit()
+        event_types_cache.invalidate()
+        events_count_cache.clear()
+
+    async def create_event_type(self, name: str, description: str) -> EventTypeSchema:
         event_type = EventType.create(name=name, description=description)
         self.session.add(event_type)
-        self.session.commit()
+        await self.session.commit()
+        event_types_cache.invalidate()
         return EventTypeSchema(
             id=event_type.id,
             name=event_type.name,
             description=event_type.description,
             is_deletable=event_type.is_deletable,
         )
+
+
+def _delete_event_type(event_type_id: str) -> Delete:
+    return (
+        delete(EventType)
+        .where(EventType.id == event_type_id)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,70 +1,268 @@
 from datetime import date
-from tracemalloc import start
 from uuid import UUID
 
-from api.error_handlers import InvalidRequest
-from api.schemas import EventType, UpcomingEvent
+from api.repositories.keyset_cursor import KeysetCursor
+from api.schemas import EventType as EventTypeSchema
+from api.schemas import UpcomingEvent
 from db.models.event import Event
-from sqlalchemy.orm import Session
+from db.models.event_type import EventType
+from db.models.medical_record import MedicalRecord
+from sqlalchemy import (ColumnElement, Delete, Row, Select, delete, func,
+                        select, text, tuple_)
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
+from utils.metrics import metrics
+from utils.settings import AppSettings
+from utils.ttl_cache import TTLCache
 
+_settings = AppSettings()
 
-class EventsRepository:
+# Filter key -> total. Writes through the repositories clear it; other writers
+# are picked up once entries expire.
+events_count_cache: TTLCache[tuple, int] = TTLCache(
+    max_entries=_settings.EVENTS_COUNT_CACHE_MAX_ENTRIES,
+    ttl_seconds=_settings.EVENTS_COUNT_CACHE_TTL_SECONDS,
+)
+
+events_cursor: KeysetCursor[date] = KeysetCursor("date", date.fromisoformat)
+
+
+class AsyncEventsRepository:
     def __init__(
         self,
-        session: Session,
+        session: AsyncSession,
     ):
         self.session = session
 
-    def get_events(
+    async def get_events(
         self,
         *,
         page: int = 1,
         page_size: int = 20,
+        cursor: str | None = None,
+        event_type_ids: list[str] | None = None,
+        medical_record_ids: list[UUID] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> tuple[list[UpcomingEvent], str | None]:
+        """Return one page of events ordered by `(date, id)`.
+
+        With `cursor` (a `next_cursor` from a previous page) the page starts
+        right after that event via a keyset seek, so deep pages cost the same
+        as the first and rows inserted meanwhile don't shift the window.
+        Otherwise `page` is used as an offset.
+        """
+        statement = _events_page_statement(
+            page,
+            page_size,
+            cursor,
+            _event_filters(
+                event_type_ids=event_type_ids,
+                medical_record_ids=medical_record_ids,
+                start_date=start_date,
+                end_date=end_date,
+            ),
+        )
+        result = await self.session.execute(statement)
+        return _events_page(result.all(), page_size)
+
+    async def count_events(
+        self,
+        *,
         event_type_ids: list[str] | None = None,
         medical_record_ids: list[UUID] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
-    ) -> tuple[list[UpcomingEvent], int]:
-        query = self.session.query(Event)
-
-        if event_type_ids:
-            query = query.filter(Event.event_type_id.in_(event_type_ids))
-        if medical_record_ids:
-            query = query.filter(Event.medical_record_id.in_(medical_record_ids))
-        if start_date:
-            query = query.filter(Event.date >= start_date)
-        else:
-            query = query.filter(Event.date >= date.today())
-        if end_date:
-            query = query.filter(Event.date <= end_date)
-
-        total = query.count()
-
-        page = max(page, 1)
-        page_size = max(page_size, 1)
-
-        events: list[Event] = (
-            query.order_by(Event.date)
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
+    ) -> tuple[int, bool]:
+        """Return `(total, is_exact)` for the events matching the filters.
+
+        Totals are cached for a few seconds per filter set and served as
+        inexact. Unfiltered totals on Postgres use the planner's row estimate
+        once the table is large enough that an exact COUNT gets expensive.
+        """
+        cache_key = _count_cache_key(
+            event_type_ids, medical_record_ids, start_date, end_date
+        )
+        cached_total = _cached_count(cache_key)
+        if cached_total is not None:
+            return cached_total, False
+
+        filters = _event_filters(
+            event_type_ids=event_type_ids,
+            medical_record_ids=medical_record_ids,
+            start_date=start_date,
+            end_date=end_date,
         )
+        dialect = self.session.bind.dialect
+        if _should_estimate(dialect, cache_key):
+            plan = await self.session.scalar(_explain_statement(dialect, filters))
+            estimate = _planned_rows(plan)
+            if estimate >= _settings.EVENTS_COUNT_ESTIMATE_MIN_ROWS:
+                events_count_cache.set(cache_key, estimate)
+                return estimate, False
+
+        total = (await self.session.execute(_count_statement(filters))).scalar_one()
+        events_count_cache.set(cache_key, total)
+        return total, True
+
+
+async def delete_events(session: AsyncSession, *criteria: ColumnElement[bool]) -> int:
+    """Delete the events matching `criteria` in committed batches.
+
+    Each batch is one DELETE of at most `EVENTS_DELETE_BATCH_SIZE` rows, so no
+    transaction holds row locks on a large set or loads events into Python.
+    """
+    deleted = 0
+    while True:
+        batch = (await session.execute(_delete_events_batch(criteria))).rowcount
+        await session.commit()
+        deleted += batch
+        if batch < _settings.EVENTS_DELETE_BATCH_SIZE:
+            break
+    metrics.increment("events.deleted", deleted)
+    return deleted
+
+
+def _delete_events_batch(criteria: tuple[ColumnElement[bool], ...]) -> Delete:
+    batch_ids = (
+        select(Event.id)
+        .where(*criteria)
+        .limit(_settings.EVENTS_DELETE_BATCH_SIZE)
+        .scalar_subquery()
+    )
+    return (
+        delete(Event)
+        .where(Event.id.in_(batch_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _event_filters(
+    *,
+    event_type_ids: list[str] | None,
+    medical_record_ids: list[UUID] | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> list[ColumnElement[bool]]:
+    filters = [Event.date >= (start_date or date.today())]
+    if event_type_ids:
+        filters.append(Event.event_type_id.in_(event_type_ids))
+    if medical_record_ids:
+        filters.append(Event.medical_record_id.in_(medical_record_ids))
+    if end_date:
+        filters.append(Event.date <= end_date)
+    return filters
+
+
+def _events_page_statement(
+    page: int, page_size: int, cursor: str | None, filters: list[ColumnElement[bool]]
+) -> Select:
+    page = max(page, 1)
+    page_size = max(page_size, 1)
+
+    # Select only the columns UpcomingEvent needs, joined in one statement
+    # instead of lazy-loading the type and record of every row.
+    statement = (
+        select(
+            Event.id,
+            Event.date,
+            Event.event,
+            Event.medical_record_id,
+            EventType.id.label("type_id"),
+            EventType.name.label("type_name"),
+            EventType.description.label("type_description"),
+            EventType.is_deletable.label("type_is_deletable"),
+            MedicalRecord.filename.label("medical_record_filename"),
+        )
+        .join(Event.type)
+        .join(Event.medical_record)
+        .where(*filters)
+        .order_by(Event.date, Event.id)
+    )
+    if cursor:
+        statement = statement.where(
+            tuple_(Event.date, Event.id) > events_cursor.decode(cursor)
+        )
+    else:
+        statement = statement.offset((page - 1) * page_size)
+    # One extra row tells whether another page follows.
+    return statement.limit(page_size + 1)
+
+
+def _events_page(
+    rows: list[Row], page_size: int
+) -> tuple[list[UpcomingEvent], str | None]:
+    page_size = max(page_size, 1)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = events_cursor.encode(rows[-1].date, rows[-1].id)
+
+    result = [
+        UpcomingEvent(
+            type=EventTypeSchema(
+                id=row.type_id,
+                name=row.type_name,
+                description=row.type_description,
+                is_deletable=row.type_is_deletable,
+            ),
+            description=row.event,
+            date=row.date,
+            medical_record_id=row.medical_record_id,
+            medical_record_filename=row.medical_record_filename,
+        )
+        for row in rows
+    ]
+    return result, next_cursor
+
+
+def _count_cache_key(
+    event_type_ids: list[str] | None,
+    medical_record_ids: list[UUID] | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> tuple:
+    return (
+        tuple(sorted(event_type_ids or [])),
+        tuple(sorted(str(m_id) for m_id in medical_record_ids or [])),
+        start_date or date.today(),
+        end_date,
+    )
+
+
+def _cached_count(cache_key: tuple) -> int | None:
+    cached_total = events_count_cache.get(cache_key)
+    if cached_total is not None:
+        metrics.increment("events.count.cache.hit")
+    else:
+        metrics.increment("events.count.cache.miss")
+    return cached_total
+
+
+def _should_estimate(dialect: Dialect, cache_key: tuple) -> bool:
+    event_type_ids, medical_record_ids, start_date, end_date = cache_key
+    unfiltered = (
+        not (event_type_ids or medical_record_ids or end_date)
+        and start_date == date.today()
+    )
+    return unfiltered and dialect.name == "postgresql"
+
+
+def _count_statement(filters: list[ColumnElement[bool]]) -> Select:
+    return select(func.count()).select_from(Event).where(*filters)
+
+
+def _explain_statement(
+    dialect: Dialect, filters: list[ColumnElement[bool]]
+) -> TextClause:
+    statement = (
+        select(Event.id)
+        .where(*filters)
+        .compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    )
+    return text(f"EXPLAIN (FORMAT JSON) {statement}")
+
 
-        result: list[UpcomingEvent] = []
-        for event in events:
-            record = getattr(event, "medical_record", None)
-            result.append(
-                UpcomingEvent(
-                    type=EventType(
-                        id=event.type.id,
-                        name=event.type.name,
-                        description=event.type.description,
-                        is_deletable=event.type.is_deletable,
-                    ),
-                    description=event.event,
-                    date=event.date,
-                    medical_record_id=event.medical_record_id,
-                    medical_record_filename=getattr(record, "filename", None),
-                )
-            )
-        return result, total
+def _planned_rows(plan: list[dict]) -> int:
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,37 @@
+import zlib
+
+from db.models.extracted_text import ExtractedText
+from db.upsert import dialect_insert
+from sqlalchemy.orm import Session
+
+
+class ExtractedTextsRepository:
+    def __init__(
+        self,
+        session: Session,
+    ):
+        self.session = session
+
+    def get_text(self, content_hash: str, extractor_version: str) -> str | None:
+        extracted_text: ExtractedText | None = self.session.get(
+            ExtractedText, (content_hash, extractor_version)
+        )
+        if not extracted_text:
+            return None
+        return zlib.decompress(extracted_text.compressed_text).decode("utf-8")
+
+    def save_text(self, content_hash: str, extractor_version: str, text: str) -> None:
+        # Concurrent uploads of the same PDF extract the same text; whichever
+        # commits second keeps the stored row instead of failing.
+        self.session.execute(
+            dialect_insert(self.session, ExtractedText)
+            .values(
+                content_hash=content_hash,
+                extractor_version=extractor_version,
+                compressed_text=zlib.compress(text.encode("utf-8")),
+            )
+            .on_conflict_do_nothing(
+                index_elements=["content_hash", "extractor_version"]
+            )
+        )
+        self.session.commit()
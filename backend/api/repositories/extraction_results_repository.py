@@ -0,0 +1,61 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from api.services.baml_client.types import MedicalAlert
+from db.models.extraction_result import ExtractionResult
+from db.upsert import dialect_insert
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+
+class ExtractionResultsRepository:
+    def __init__(
+        self,
+        session: Session,
+    ):
+        self.session = session
+
+    def get_alerts(self, cache_key: str) -> list[MedicalAlert] | None:
+        result: ExtractionResult | None = self.session.get(ExtractionResult, cache_key)
+        if not result or _as_utc(result.expires_time) <= datetime.now(timezone.utc):
+            return None
+        return [
+            MedicalAlert.model_validate(alert) for alert in json.loads(result.alerts)
+        ]
+
+    def save_alerts(
+        self, cache_key: str, alerts: list[MedicalAlert], ttl_seconds: int
+    ) -> None:
+        values = {
+            "alerts": json.dumps([alert.model_dump() for alert in alerts]),
+            "expires_time": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+        }
+        # Identical extractions may finish concurrently; the last one wins.
+        self.session.execute(
+            dialect_insert(self.session, ExtractionResult)
+            .values(cache_key=cache_key, **values)
+            .on_conflict_do_update(index_elements=["cache_key"], set_=values)
+        )
+        self.session.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        result = self.session.execute(
+            delete(ExtractionResult)
+            .where(ExtractionResult.expires_time <= datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def delete_alerts(self, cache_key: str | None = None) -> None:
+        query = self.session.query(ExtractionResult)
+        if cache_key is not None:
+            query = query.filter(ExtractionResult.cache_key == cache_key)
+        query.delete(synchronize_session=False)
+        self.session.commit()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite drops the timezone on round-trip; values are always stored in UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable
+from datetime import date
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from api.error_handlers import InvalidRequest
+
+SortKey = TypeVar("SortKey", bound=date)
+
+
+class KeysetCursor(Generic[SortKey]):
+    """Opaque `next_cursor` token for pages ordered by `(sort key, id)`.
+
+    The token is URL-safe base64 JSON holding the last row's sort key under
+    `key_name` and its id; `parse_key` turns the stored ISO string back into a
+    sort key value.
+    """
+
+    def __init__(self, key_name: str, parse_key: Callable[[str], SortKey]):
+        self.key_name = key_name
+        self.parse_key = parse_key
+
+    def encode(self, key: SortKey, row_id: UUID) -> str:
+        payload = json.dumps({self.key_name: key.isoformat(), "id": str(row_id)})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[SortKey, UUID]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            return self.parse_key(payload[self.key_name]), UUID(payload["id"])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise InvalidRequest("Invalid cursor")
@@ -1,17 +1,43 @@
+import asyncio
+import traceback
 import uuid
 from datetime import datetime
+from pathlib import Path
+from typing import Any
 
 from api.error_handlers import InvalidRequest
-from api.schemas import EventType as EventTypeSchema
+from api.repositories.events_repository import (delete_events,
+                                                events_count_cache)
+from api.repositories.extracted_texts_repository import \
+    ExtractedTextsRepository
+from api.repositories.keyset_cursor import KeysetCursor
+from api.schemas import IngestionStage
 from api.schemas import MedicalRecord as MedicalRecordSchema
-from api.schemas import UpcomingEvent
+from api.schemas import MedicalRecordUploadResponse, UpcomingEvent
+from api.services.event_types_cache import (EventTypesSnapshot,
+                                            event_types_cache)
 from api.services.events_extraction_service import EventsExtractionService
-from api.services.text_extraction_service import TextExtractionService
+from api.services.ingestion_progress import IngestionListener
+from api.services.text_extraction_service import (EXTRACTOR_VERSION,
+                                                  PageCallback,
+                                                  TextExtractionService)
 from db.models.event import Event
-from db.models.event_type import EventType
 from db.models.medical_record import MedicalRecord
+from sqlalchemy import (ColumnElement, Delete, Row, Select, delete, func,
+                        insert, select, tuple_)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from utils.metrics import metrics
+from utils.settings import AppSettings
 from utils.storage import MinioClient
+from utils.uploads import SpooledUpload
+
+_settings = AppSettings()
+
+medical_records_cursor: KeysetCursor[datetime] = KeysetCursor(
+    "created_time", datetime.fromisoformat
+)
 
 
 class MedicalRecordsRepository:
@@ -19,77 +45,346 @@ class MedicalRecordsRepository:
         self,
         text_extraction_service: TextExtractionService,
         events_extraction_service: EventsExtractionService,
+        extracted_texts_repository: ExtractedTextsRepository,
         storage: MinioClient,
         session: Session,
     ):
         self.text_extraction_service = text_extraction_service
         self.events_extraction_service = events_extraction_service
+        self.extracted_texts_repository = extracted_texts_repository
         self.storage = storage
         self.session = session
 
-    def delete_medical_record(self, medical_record_id: uuid.UUID) -> None:
-        medical_record: MedicalRecord | None = (
-            self.session.query(MedicalRecord)
-            .filter(MedicalRecord.id == medical_record_id)
-            .one_or_none()
-        )
-        if not medical_record:
-            raise InvalidRequest(f"Medical record {medical_record_id} not found")
-        self.session.delete(medical_record)
-        self.session.commit()
+    async def process_medical_record(
+        self,
+        upload: SpooledUpload,
+        filename: str,
+        listener: IngestionListener | None = None,
+    ) -> MedicalRecordUploadResponse:
+        listener = listener or IngestionListener()
+        # The session is synchronous, so its queries run in a worker thread
+        # instead of blocking the event loop.
+        taxonomy = await run_in_threadpool(event_types_cache.get, self.session)
 
-    def process_medical_record(self, blob: bytes, filename: str) -> list[UpcomingEvent]:
         medical_record_id = uuid.uuid4()
         medical_record = MedicalRecord(id=medical_record_id, filename=filename)
-        self.session.add(medical_record)
-
-        text = self.text_extraction_service.extract_text_from_pdf(blob)
 
-        event_types: list[EventType] = self.session.query(EventType).all()
-        medical_events = self.events_extraction_service.extract_events(
-            text=text, event_types=event_types
+        # The object upload only needs the spooled file, so it runs in a thread
+        # alongside extraction and is joined before the row is committed.
+        storage_key = medical_record.storage_uri
+        store_task = asyncio.create_task(
+            run_in_threadpool(self.storage.put_path, key=storage_key, path=upload.path)
         )
+        try:
+            events, cache_hit = await self._collect_events(
+                upload, medical_record_id, taxonomy, listener
+            )
+            listener.on_stage(IngestionStage.UPLOADING)
+            await store_task
+            listener.on_stage(IngestionStage.SAVING)
+            await run_in_threadpool(
+                insert_medical_record, self.session, medical_record, events
+            )
+        except BaseException:
+            await self._discard_stored_file(store_task, storage_key)
+            raise
 
-        upcoming_events = []
-        for medical_event in medical_events:
-            event_date = datetime.fromisoformat(medical_event.date).date()
-            self.session.add(
-                Event(
-                    medical_record_id=medical_record_id,
-                    event_type_id=medical_event.type.id,
-                    event=medical_event.event,
-                    date=event_date,
-                )
+        upcoming_events = [
+            UpcomingEvent(
+                type=taxonomy.event_types[event["event_type_id"]],
+                description=event["event"],
+                date=event["date"],
+                medical_record_id=medical_record_id,
+                medical_record_filename=filename,
             )
-            upcoming_events.append(
-                UpcomingEvent(
-                    type=EventTypeSchema(
-                        id=medical_event.type.id,
-                        name=medical_event.type.name,
-                        description=medical_event.type.description,
-                        is_deletable=False,
-                    ),
-                    description=medical_event.event,
-                    date=event_date,
+            for event in events
+        ]
+        return MedicalRecordUploadResponse(
+            events=sorted(upcoming_events, key=lambda x: x.date, reverse=True),
+            medical_record_id=medical_record_id,
+            cache_hit=cache_hit,
+        )
+
+    async def _collect_events(
+        self,
+        upload: SpooledUpload,
+        medical_record_id: uuid.UUID,
+        taxonomy: EventTypesSnapshot,
+        listener: IngestionListener,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        # Re-uploads are served by the text and extraction caches, which key on
+        # the extractor/prompt versions and the current taxonomy, so a stale
+        # taxonomy never leaks into the new record's events.
+        listener.on_stage(IngestionStage.EXTRACTING_TEXT)
+        text, text_cached = await self._extract_text(
+            upload.path, upload.content_hash, on_page=listener.on_page
+        )
+
+        listener.on_stage(IngestionStage.EXTRACTING_EVENTS)
+        medical_events = await self.events_extraction_service.extract_events(
+            text=text,
+            alert_types=taxonomy.alert_types,
+            on_alert=listener.on_alert,
+        )
+        events = [
+            {
+                "medical_record_id": medical_record_id,
+                "event_type_id": medical_event.type.id,
+                "event": medical_event.event,
+                "date": datetime.fromisoformat(medical_event.date).date(),
+            }
+            for medical_event in medical_events
+        ]
+        return events, text_cached
+
+    async def _discard_stored_file(
+        self, store_task: "asyncio.Task[None]", storage_key: str
+    ) -> None:
+        # Wait for the upload thread to finish before the caller deletes the
+        # spooled file, then remove the object no row will point to.
+        try:
+            await store_task
+        except Exception:
+            return
+        try:
+            await run_in_threadpool(self.storage.remove_object, storage_key)
+        except Exception:
+            traceback.print_exc()
+
+    async def _extract_text(
+        self, pdf_path: Path, content_hash: str, on_page: PageCallback | None = None
+    ) -> tuple[str, bool]:
+        text = await run_in_threadpool(
+            self.extracted_texts_repository.get_text, content_hash, EXTRACTOR_VERSION
+        )
+        if text is not None:
+            metrics.increment("extracted_texts.cache.hit")
+            return text, True
+        metrics.increment("extracted_texts.cache.miss")
+        text = await self.text_extraction_service.extract_text_from_pdf(
+            pdf_path, on_page=on_page
+        )
+        await run_in_threadpool(
+            self.extracted_texts_repository.save_text,
+            content_hash,
+            EXTRACTOR_VERSION,
+            text,
+        )
+        return text, False
+
+
+class AsyncMedicalRecordsRepository:
+    """Read and delete paths for medical records, on an `AsyncSession`.
+
+    Ingestion stays on `MedicalRecordsRepository`, which also runs from
+    background jobs outside a request.
+    """
+
+    def __init__(
+        self,
+        storage: MinioClient,
+        session: AsyncSession,
+    ):
+        self.storage = storage
+        self.session = session
+
+    async def delete_medical_record(self, medical_record_id: uuid.UUID) -> None:
+        medical_record = await self.session.get(MedicalRecord, medical_record_id)
+        if medical_record is None:
+            raise InvalidRequest(f"Medical record {medical_record_id} not found")
+        storage_key = medical_record.storage_uri
+        # Events go first in bounded batches; the ON DELETE CASCADE on
+        # events.medical_record_id catches any inserted in the meantime.
+        await delete_events(self.session, Event.medical_record_id == medical_record_id)
+        await self.session.execute(_delete_medical_records([medical_record_id]))
+        await self.session.commit()
+        events_count_cache.clear()
+        await run_in_threadpool(_remove_stored_files, self.storage, [storage_key])
+
+    async def delete_medical_records(
+        self,
+        *,
+        ids: list[uuid.UUID] | None = None,
+        filename_prefix: str | None = None,
+        created_before: datetime | None = None,
+    ) -> int:
+        """Delete every medical record matching all given criteria.
+
+        Records are removed `MEDICAL_RECORDS_DELETE_BATCH_SIZE` at a time, each
+        batch committed before its PDFs are removed from storage. Objects whose
+        removal fails are left to the orphaned-object sweeper.
+        """
+        criteria = _medical_record_filters(
+            ids=ids, filename_prefix=filename_prefix, created_before=created_before
+        )
+
+        batch_size = _settings.MEDICAL_RECORDS_DELETE_BATCH_SIZE
+        deleted = 0
+        while True:
+            rows = (
+                await self.session.execute(
+                    select(MedicalRecord.id, MedicalRecord.filename)
+                    .where(*criteria)
+                    .order_by(MedicalRecord.id)
+                    .limit(batch_size)
                 )
+            ).all()
+            if not rows:
+                break
+            batch_ids = [row.id for row in rows]
+            await delete_events(self.session, Event.medical_record_id.in_(batch_ids))
+            await self.session.execute(_delete_medical_records(batch_ids))
+            await self.session.commit()
+            events_count_cache.clear()
+            deleted += len(rows)
+            await run_in_threadpool(
+                _remove_stored_files,
+                self.storage,
+                [MedicalRecord.build_storage_uri(row.id, row.filename) for row in rows],
             )
+            if len(rows) < batch_size:
+                break
+        metrics.increment("medical_records.deleted", deleted)
+        return deleted
+
+    async def get_medical_records(
+        self,
+        *,
+        page_size: int = 50,
+        cursor: str | None = None,
+        filename_prefix: str | None = None,
+        filename_contains: str | None = None,
+    ) -> tuple[list[MedicalRecordSchema], str | None]:
+        """Return one page of medical records, newest first, with event counts.
 
-        self.session.commit()
-        self.storage.put_file(key=medical_record.storage_uri, data=blob)
+        Pages are keyset-paginated on `(created_time, id)`: pass the returned
+        `next_cursor` to get the following page.
+        """
+        statement = _medical_records_page_statement(
+            page_size,
+            cursor,
+            _medical_record_filters(
+                filename_prefix=filename_prefix, filename_contains=filename_contains
+            ),
+        )
+        result = await self.session.execute(statement)
+        return _medical_records_page(result.all(), page_size)
 
-        return sorted(upcoming_events, key=lambda x: x.date, reverse=True)
 
-    def get_medical_records(self) -> list[MedicalRecordSchema]:
-        medical_records: list[MedicalRecord] = (
-            self.session.query(MedicalRecord)
-            .order_by(MedicalRecord.created_time.desc())
-            .all()
+def _medical_record_filters(
+    *,
+    ids: list[uuid.UUID] | None = None,
+    filename_prefix: str | None = None,
+    filename_contains: str | None = None,
+    created_before: datetime | None = None,
+) -> list[ColumnElement[bool]]:
+    # The filename filters are LIKE patterns, served on Postgres by the trigram
+    # index on medical_records.filename.
+    filters: list[ColumnElement[bool]] = []
+    if ids is not None:
+        filters.append(MedicalRecord.id.in_(ids))
+    if filename_prefix:
+        filters.append(
+            MedicalRecord.filename.startswith(filename_prefix, autoescape=True)
         )
-        return [
-            MedicalRecordSchema(
-                id=medical_record.id,
-                filename=medical_record.filename,
-                created_time=medical_record.created_time,
-            )
-            for medical_record in medical_records
-        ]
+    if filename_contains:
+        filters.append(
+            MedicalRecord.filename.icontains(filename_contains, autoescape=True)
+        )
+    if created_before:
+        filters.append(MedicalRecord.created_time < created_before)
+    return filters
+
+
+def _medical_records_page_statement(
+    page_size: int, cursor: str | None, filters: list[ColumnElement[bool]]
+) -> Select:
+    page_size = max(page_size, 1)
+    # Counted per row of the page only, through the index on
+    # events.medical_record_id, instead of a GROUP BY over all events.
+    event_count = (
+        select(func.count())
+        .select_from(Event)
+        .where(Event.medical_record_id == MedicalRecord.id)
+        .correlate(MedicalRecord)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            MedicalRecord.id,
+            MedicalRecord.filename,
+            MedicalRecord.created_time,
+            event_count.label("event_count"),
+        )
+        .where(*filters)
+        .order_by(MedicalRecord.created_time.desc(), MedicalRecord.id.desc())
+    )
+    if cursor:
+        statement = statement.where(
+            tuple_(MedicalRecord.created_time, MedicalRecord.id)
+            < medical_records_cursor.decode(cursor)
+        )
+    # One extra row tells whether another page follows.
+    return statement.limit(page_size + 1)
+
+
+def _medical_records_page(
+    rows: list[Row], page_size: int
+) -> tuple[list[MedicalRecordSchema], str | None]:
+    page_size = max(page_size, 1)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = medical_records_cursor.encode(rows[-1].created_time, rows[-1].id)
+    medical_records = [
+        MedicalRecordSchema(
+            id=row.id,
+            filename=row.filename,
+            created_time=row.created_time,
+            event_count=row.event_count,
+        )
+        for row in rows
+    ]
+    return medical_records, next_cursor
+
+
+def _delete_medical_records(medical_record_ids: list[uuid.UUID]) -> Delete:
+    return (
+        delete(MedicalRecord)
+        .where(MedicalRecord.id.in_(medical_record_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _remove_stored_files(storage: MinioClient, storage_keys: list[str]) -> None:
+    # The rows are already gone, so a failure here only leaves orphaned objects
+    # for the sweeper (failed keys are counted by `remove_objects`); it must not
+    # fail the delete.
+    try:
+        storage.remove_objects(storage_keys)
+    except Exception:
+        traceback.print_exc()
+
+
+def insert_medical_record(
+    session: Session, medical_record: MedicalRecord, events: list[dict[str, Any]]
+) -> None:
+    """Insert a medical record and its event rows, then commit.
+
+    Uses bulk INSERTs instead of the unit of work, so events are sent as
+    batched multi-row statements without building ORM objects for them.
+    """
+    session.execute(
+        insert(MedicalRecord),
+        [
+            {
+                "id": medical_record.id,
+                "filename": medical_record.filename,
+            }
+        ],
+    )
+    if events:
+        session.execute(insert(Event), events)
+    session.commit()
+    events_count_cache.clear()
+    metrics.increment("medical_records.events.inserted", len(events))
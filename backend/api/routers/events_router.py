@@ -2,7 +2,7 @@ from datetime import date
 from uuid import UUID
 
 from api.dependencies import get_events_repository
-from api.repositories.events_repository import EventsRepository
+from api.repositories.events_repository import AsyncEventsRepository
 from api.schemas import EventsResponse
 from fastapi import APIRouter, Depends, Query
 
@@ -13,15 +13,15 @@ router = APIRouter(prefix="/events", tags=["events"])
 async def get_events(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    include_total: bool = True,
     event_type_ids: list[str] | None = Query(default=None),
     medical_record_ids: list[str] | None = Query(default=None),
     start_date: date | None = None,
     end_date: date | None = None,
-    events_repository: EventsRepository = Depends(get_events_repository),
+    events_repository: AsyncEventsRepository = Depends(get_events_repository),
 ) -> EventsResponse:
-    events, total = events_repository.get_events(
-        page=page,
-        page_size=page_size,
+    filters = dict(
         event_type_ids=event_type_ids,
         medical_record_ids=[UUID(m_id) for m_id in medical_record_ids]
         if medical_record_ids
@@ -29,9 +29,19 @@ async def get_events(
         start_date=start_date,
         end_date=end_date,
     )
+    events, next_cursor = await events_repository.get_events(
+        page=page, page_size=page_size, cursor=cursor, **filters
+    )
+    total, total_is_exact = (
+        await events_repository.count_events(**filters)
+        if include_total
+        else (None, None)
+    )
     return EventsResponse(
         events=events,
         total=total,
-        page=page,
+        total_is_exact=total_is_exact,
+        page=None if cursor else page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
@@ -0,0 +1,24 @@
+from api.dependencies import get_extraction_cache_service
+from api.services.extraction_cache_service import ExtractionCacheService
+from fastapi import APIRouter, Depends
+
+router = APIRouter(prefix="/extraction-cache", tags=["extraction_cache"])
+
+
+@router.delete("", status_code=204)
+def clear_extraction_cache(
+    extraction_cache_service: ExtractionCacheService = Depends(
+        get_extraction_cache_service
+    ),
+) -> None:
+    extraction_cache_service.invalidate()
+
+
+@router.delete("/{cache_key}", status_code=204)
+def invalidate_extraction_cache_entry(
+    cache_key: str,
+    extraction_cache_service: ExtractionCacheService = Depends(
+        get_extraction_cache_service
+    ),
+) -> None:
+    extraction_cache_service.invalidate(cache_key)
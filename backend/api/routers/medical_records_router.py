@@ -1,47 +1,225 @@
 import uuid
+import zipfile
+from collections.abc import AsyncIterator
 
-from api.dependencies import get_medical_records_repository
+from api.dependencies import (get_async_medical_records_repository,
+                              get_ingestion_jobs_service,
+                              get_medical_records_repository,
+                              get_medical_records_repository_factory,
+                              get_session_factory, settings)
 from api.error_handlers import InvalidRequest
-from api.repositories.medical_records_repository import \
-    MedicalRecordsRepository
-from api.schemas import EventsResponse, MedicalRecordResponse
-from fastapi import APIRouter, Depends, File, UploadFile
+from api.repositories.medical_records_repository import (
+    AsyncMedicalRecordsRepository, MedicalRecordsRepository)
+from api.schemas import (BatchIngestionResponse, IngestionJob,
+                         MedicalRecordResponse, MedicalRecordsDeleteRequest,
+                         MedicalRecordsDeleteResponse,
+                         MedicalRecordUploadResponse)
+from api.services.ingestion_jobs_service import (
+    IngestionJobsService, MedicalRecordsRepositoryFactory)
+from fastapi import (APIRouter, BackgroundTasks, Depends, File, Query,
+                     UploadFile)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from utils.uploads import (ArchiveTooLarge, SpooledUpload, spool_upload,
+                           spool_zip_members)
 
 router = APIRouter(prefix="/medical-records", tags=["medical_records"])
 
 
-@router.post("", response_model=EventsResponse)
+def _validate_upload(file: UploadFile) -> str:
+    if not file.filename or not file.filename.endswith(".pdf"):
+        raise InvalidRequest("Invalid filename")
+    return file.filename
+
+
+@router.post("", response_model=MedicalRecordUploadResponse)
 async def upload_medical_record(
     file: UploadFile = File(...),
     medical_records_repository: MedicalRecordsRepository = Depends(
         get_medical_records_repository
     ),
-) -> EventsResponse:
-    if not file.filename or not file.filename.endswith(".pdf"):
-        raise InvalidRequest("Invalid filename")
-    events = medical_records_repository.process_medical_record(
-        await file.read(), filename=file.filename
+) -> MedicalRecordUploadResponse:
+    filename = _validate_upload(file)
+    upload = await spool_upload(file, directory=settings.UPLOAD_SPOOL_DIR)
+    try:
+        return await medical_records_repository.process_medical_record(
+            upload, filename=filename
+        )
+    finally:
+        upload.cleanup()
+
+
+@router.post("/jobs", response_model=IngestionJob, status_code=202)
+async def create_ingestion_job(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    build_repository: MedicalRecordsRepositoryFactory = Depends(
+        get_medical_records_repository_factory
+    ),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    ingestion_jobs_service: IngestionJobsService = Depends(get_ingestion_jobs_service),
+) -> IngestionJob:
+    filename = _validate_upload(file)
+    upload = await spool_upload(file, directory=settings.UPLOAD_SPOOL_DIR)
+    job = ingestion_jobs_service.create_job(filename=filename)
+    background_tasks.add_task(
+        ingestion_jobs_service.run_job,
+        job.id,
+        upload,
+        build_repository,
+        session_factory,
+    )
+    return job
+
+
+@router.post("/batch", response_model=BatchIngestionResponse, status_code=202)
+async def create_batch_ingestion(
+    background_tasks: BackgroundTasks,
+    files: list[UploadFile] = File(...),
+    build_repository: MedicalRecordsRepositoryFactory = Depends(
+        get_medical_records_repository_factory
+    ),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    ingestion_jobs_service: IngestionJobsService = Depends(get_ingestion_jobs_service),
+) -> BatchIngestionResponse:
+    for file in files:
+        if not file.filename or not file.filename.endswith((".pdf", ".zip")):
+            raise InvalidRequest(f"Invalid filename {file.filename!r}")
+
+    uploads: list[tuple[str, SpooledUpload]] = []
+    try:
+        for file in files:
+            if file.filename.endswith(".zip"):
+                try:
+                    uploads.extend(
+                        await spool_zip_members(
+                            file,
+                            directory=settings.UPLOAD_SPOOL_DIR,
+                            max_members=settings.BATCH_MAX_FILES - len(uploads),
+                            max_member_bytes=settings.BATCH_MAX_ZIP_MEMBER_BYTES,
+                            max_total_bytes=settings.BATCH_MAX_ZIP_TOTAL_BYTES,
+                        )
+                    )
+                except zipfile.BadZipFile:
+                    raise InvalidRequest(f"Invalid ZIP archive {file.filename!r}")
+                except ArchiveTooLarge as exc:
+                    raise InvalidRequest(f"ZIP archive {file.filename!r} {exc}")
+            else:
+                uploads.append(
+                    (
+                        file.filename,
+                        await spool_upload(file, directory=settings.UPLOAD_SPOOL_DIR),
+                    )
+                )
+            if len(uploads) > settings.BATCH_MAX_FILES:
+                raise InvalidRequest(
+                    f"A batch can contain at most {settings.BATCH_MAX_FILES} PDFs"
+                )
+        if not uploads:
+            raise InvalidRequest("No PDF files found in the upload")
+    except BaseException:
+        for _, upload in uploads:
+            upload.cleanup()
+        raise
+
+    jobs = [
+        ingestion_jobs_service.create_job(filename=filename) for filename, _ in uploads
+    ]
+    background_tasks.add_task(
+        ingestion_jobs_service.run_batch,
+        [(job.id, upload) for job, (_, upload) in zip(jobs, uploads)],
+        build_repository,
+        session_factory,
+    )
+    return BatchIngestionResponse(jobs=jobs)
+
+
+async def _spool_streamed_upload(
+    file: UploadFile = File(...),
+) -> AsyncIterator[tuple[str, SpooledUpload]]:
+    """Spool the upload and remove it once the response is over.
+
+    FastAPI runs the cleanup after the response is sent, or after the client
+    disconnects, even if the event stream was never iterated.
+    """
+    filename = _validate_upload(file)
+    upload = await spool_upload(file, directory=settings.UPLOAD_SPOOL_DIR)
+    try:
+        yield filename, upload
+    finally:
+        upload.cleanup()
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def stream_medical_record(
+    spooled: tuple[str, SpooledUpload] = Depends(_spool_streamed_upload),
+    build_repository: MedicalRecordsRepositoryFactory = Depends(
+        get_medical_records_repository_factory
+    ),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    ingestion_jobs_service: IngestionJobsService = Depends(get_ingestion_jobs_service),
+) -> StreamingResponse:
+    filename, upload = spooled
+    return StreamingResponse(
+        ingestion_jobs_service.stream(
+            upload, filename, build_repository, session_factory
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+async def get_ingestion_job(
+    job_id: uuid.UUID,
+    ingestion_jobs_service: IngestionJobsService = Depends(get_ingestion_jobs_service),
+) -> IngestionJob:
+    return ingestion_jobs_service.get_job(job_id)
+
+
+@router.post("/bulk-delete", response_model=MedicalRecordsDeleteResponse)
+async def delete_medical_records(
+    request: MedicalRecordsDeleteRequest,
+    medical_records_repository: AsyncMedicalRecordsRepository = Depends(
+        get_async_medical_records_repository
+    ),
+) -> MedicalRecordsDeleteResponse:
+    deleted = await medical_records_repository.delete_medical_records(
+        ids=request.ids,
+        filename_prefix=request.filename_prefix,
+        created_before=request.created_before,
     )
-    return EventsResponse(events=events)
+    return MedicalRecordsDeleteResponse(deleted=deleted)
 
 
 @router.delete("/{medical_record_id}", status_code=204)
 async def delete_medical_record(
     medical_record_id: uuid.UUID,
-    medical_records_repository: MedicalRecordsRepository = Depends(
-        get_medical_records_repository
+    medical_records_repository: AsyncMedicalRecordsRepository = Depends(
+        get_async_medical_records_repository
     ),
 ) -> None:
-    medical_records_repository.delete_medical_record(
+    await medical_records_repository.delete_medical_record(
         medical_record_id=medical_record_id
     )
 
 
 @router.get("", response_model=MedicalRecordResponse)
 async def get_medical_record(
-    medical_records_repository: MedicalRecordsRepository = Depends(
-        get_medical_records_repository
+    page_size: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    filename_prefix: str | None = None,
+    filename_contains: str | None = None,
+    medical_records_repository: AsyncMedicalRecordsRepository = Depends(
+        get_async_medical_records_repository
     ),
 ) -> MedicalRecordResponse:
-    medical_records = medical_records_repository.get_medical_records()
-    return MedicalRecordResponse(medical_records=medical_records)
+    medical_records, next_cursor = await medical_records_repository.get_medical_records(
+        page_size=page_size,
+        cursor=cursor,
+        filename_prefix=filename_prefix,
+        filename_contains=filename_contains,
+    )
+    return MedicalRecordResponse(
+        medical_records=medical_records, page_size=page_size, next_cursor=next_cursor
+    )
@@ -0,0 +1,16 @@
+from api.schemas import DatabasePoolsStats, MetricsResponse
+from db.session_creator import get_pool_stats
+from fastapi import APIRouter
+from utils.metrics import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_model=MetricsResponse)
+async def get_metrics() -> MetricsResponse:
+    return MetricsResponse(**metrics.snapshot())
+
+
+@router.get("/db-pool", response_model=DatabasePoolsStats)
+async def get_db_pool_stats() -> DatabasePoolsStats:
+    return DatabasePoolsStats.model_validate(get_pool_stats())
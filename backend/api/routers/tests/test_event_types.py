@@ -1,4 +1,14 @@
+import uuid
+from datetime import date
+
+import pytest
+from api.repositories import events_repository
+from db.models.event import Event
+from db.models.medical_record import MedicalRecord
+from db.session_creator import get_async_engine
 from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
 
 
 def test_get_event_types_returns_seeded_defaults(client: TestClient) -> None:
@@ -48,3 +58,67 @@ def test_delete_non_deletable_event_type_rejected(client: TestClient) -> None:
     response = client.delete("/event-types/vaccine_expirations")
     assert response.status_code == 400
     assert "not deletable" in response.json()["error"]
+
+
+def test_event_types_are_cached_until_written(
+    client: TestClient, count_statements
+) -> None:
+    client.get("/event-types")
+    with count_statements() as counter:
+        assert len(client.get("/event-types").json()) == 4
+    assert counter.count == 0
+
+    client.post(
+        "/event-types",
+        json={"name": "Lab Visits", "description": "Future lab appointments"},
+    )
+    assert "lab_visits" in {item["id"] for item in client.get("/event-types").json()}
+
+    client.delete("/event-types/lab_visits")
+    assert "lab_visits" not in {
+        item["id"] for item in client.get("/event-types").json()
+    }
+
+
+def test_delete_event_type_removes_events_in_batches(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(events_repository._settings, "EVENTS_DELETE_BATCH_SIZE", 2)
+    client.post(
+        "/event-types",
+        json={"name": "Lab Visits", "description": "Future lab appointments"},
+    )
+    medical_record_id = uuid.uuid4()
+    db_session.execute(
+        insert(MedicalRecord), [{"id": medical_record_id, "filename": "a.pdf"}]
+    )
+    db_session.execute(
+        insert(Event),
+        [
+            {
+                "medical_record_id": medical_record_id,
+                "event_type_id": event_type_id,
+                "event": "lab",
+                "date": date.today(),
+            }
+            for event_type_id in ["lab_visits"] * 5 + ["routine_exams"]
+        ],
+    )
+    db_session.commit()
+
+    deletes: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM events"):
+            deletes.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.delete("/event-types/lab_visits").status_code == 204
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    # 5 events in batches of 2: two full batches and a final short one.
+    assert len(deletes) == 3
+    assert db_session.scalars(select(Event.event_type_id)).all() == ["routine_exams"]
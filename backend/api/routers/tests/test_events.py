@@ -254,3 +254,80 @@ def test_get_events_combines_filters(client: TestClient, seeded_events) -> None:
     assert response.status_code == 200
     assert payload["total"] == 1
     assert payload["events"][0]["description"] == "custom-apr"
+
+
+def test_get_events_cursor_pagination_is_stable_across_inserts(
+    client: TestClient, db_session: Session
+) -> None:
+    _ensure_event_type(db_session, "custom_type", "CUSTOM_TYPE")
+    record_id = _create_medical_record(db_session).id
+    shared_date = date.today() + timedelta(days=1)
+    for idx in range(5):
+        _add_event(
+            db_session,
+            event_type_id="custom_type",
+            event_date=shared_date,
+            description=f"event-{idx}",
+            medical_record_id=record_id,
+        )
+
+    first = client.get("/events", params={"page_size": 2}).json()
+    assert first["next_cursor"]
+    # A row sorting before the cursor must not shift the following pages.
+    _add_event(
+        db_session,
+        event_type_id="custom_type",
+        event_date=date.today(),
+        description="late-arrival",
+    )
+
+    seen = [event["description"] for event in first["events"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        payload = client.get(
+            "/events", params={"page_size": 2, "cursor": cursor}
+        ).json()
+        assert payload["page"] is None
+        seen.extend(event["description"] for event in payload["events"])
+        cursor = payload["next_cursor"]
+
+    assert sorted(seen) == [f"event-{idx}" for idx in range(5)]
+
+
+def test_get_events_rejects_invalid_cursor(client: TestClient) -> None:
+    response = client.get("/events", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid cursor"
+
+
+def test_get_events_can_skip_total(client: TestClient, seeded_events) -> None:
+    payload = client.get("/events", params={"include_total": False}).json()
+    assert payload["total"] is None
+    assert payload["total_is_exact"] is None
+    assert len(payload["events"]) == 5
+
+
+def test_get_events_serves_recent_totals_from_cache(
+    client: TestClient, db_session: Session, seeded_events
+) -> None:
+    first = client.get("/events").json()
+    assert first["total"] == 5
+    assert first["total_is_exact"] is True
+
+    # Direct writes bypass invalidation, so the short-lived total is reused.
+    _add_event(
+        db_session,
+        event_type_id="vaccine_expirations",
+        event_date=FUTURE_BASE_DATE,
+        description="direct-insert",
+    )
+    second = client.get("/events").json()
+    assert second["total"] == 5
+    assert second["total_is_exact"] is False
+    assert len(second["events"]) == 6
+
+    record_id = seeded_events["records"]["record_a"]
+    assert client.delete(f"/medical-records/{record_id}").status_code == 204
+    third = client.get("/events").json()
+    assert third["total"] == 4
+    assert third["total_is_exact"] is True
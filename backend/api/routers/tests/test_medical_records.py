@@ -1,8 +1,24 @@
+import asyncio
+import io
+import json
+import uuid
+import zipfile
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pytest
+from api.conftest import (StubEventsExtractionService, StubStorage,
+                          StubTextExtractionService)
+from api.dependencies import (get_events_extraction_service_factory,
+                              get_ingestion_jobs_service, get_storage,
+                              get_text_extraction_service, settings)
+from api.error_handlers import InvalidRequest
+from api.main import app
+from api.repositories import medical_records_repository
+from db.models.event import Event
 from db.models.medical_record import MedicalRecord
 from fastapi.testclient import TestClient
+from sqlalchemy import insert
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "tests" / "data"
 
@@ -38,6 +54,7 @@ def test_delete_medical_record_removes_entry(client: TestClient, db_session) ->
     delete_response = client.delete(f"/medical-records/{record_id}")
     assert delete_response.status_code == 204
     assert db_session.query(MedicalRecord).count() == 0
+    assert db_session.query(Event).count() == 0
 
 
 def test_upload_with_blank_filename_returns_validation_error(
@@ -55,3 +72,475 @@ def test_delete_missing_medical_record_returns_error(client: TestClient) -> None
     response = client.delete("/medical-records/00000000-0000-0000-0000-000000000000")
     assert response.status_code == 400
     assert "not found" in response.json()["error"]
+
+
+def test_ingestion_job_runs_pipeline_and_reports_events(client: TestClient) -> None:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records/jobs",
+            files={"file": (pdf_path.name, file_obj, "application/pdf")},
+        )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["stage"] == "queued"
+
+    status_response = client.get(f"/medical-records/jobs/{job['id']}")
+    assert status_response.status_code == 200
+    status = status_response.json()
+    assert status["stage"] == "completed"
+    assert status["progress"] == 1.0
+    assert len(status["events"]) == 1
+    assert client.get("/events").json()["total"] == 1
+
+
+def test_get_missing_ingestion_job_returns_error(client: TestClient) -> None:
+    response = client.get("/medical-records/jobs/00000000-0000-0000-0000-000000000000")
+    assert response.status_code == 400
+    assert "not found" in response.json()["error"]
+
+
+def test_batch_upload_accepts_pdfs_and_zip_archives(client: TestClient) -> None:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.write(pdf_path, arcname=f"clinic/{pdf_path.name}")
+        zip_file.writestr("__MACOSX/._record.pdf", b"")
+        zip_file.writestr("notes.txt", b"not a pdf")
+
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records/batch",
+            files=[
+                ("files", (pdf_path.name, file_obj, "application/pdf")),
+                ("files", ("records.zip", archive.getvalue(), "application/zip")),
+            ],
+        )
+
+    assert response.status_code == 202
+    jobs = response.json()["jobs"]
+    assert [job["filename"] for job in jobs] == [pdf_path.name, pdf_path.name]
+    statuses = [client.get(f"/medical-records/jobs/{job['id']}").json() for job in jobs]
+    assert [status["stage"] for status in statuses] == ["completed", "completed"]
+    assert client.get("/events").json()["total"] == 2
+
+
+def test_batch_upload_runs_each_job_in_its_own_session(client: TestClient) -> None:
+    sessions = []
+
+    class RecordingEventsExtractionService(StubEventsExtractionService):
+        def __init__(self, session=None) -> None:
+            super().__init__(session=session)
+            sessions.append(session)
+
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: RecordingEventsExtractionService
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    response = client.post(
+        "/medical-records/batch",
+        files=[
+            ("files", (pdf_path.name, pdf_path.read_bytes(), "application/pdf"))
+            for _ in range(3)
+        ],
+    )
+
+    assert response.status_code == 202
+    stages = [
+        client.get(f"/medical-records/jobs/{job['id']}").json()["stage"]
+        for job in response.json()["jobs"]
+    ]
+    assert stages == ["completed"] * 3
+    assert len(sessions) == 3
+    assert len({id(session) for session in sessions}) == 3
+
+
+def test_batch_upload_rejects_invalid_zip(client: TestClient) -> None:
+    response = client.post(
+        "/medical-records/batch",
+        files=[("files", ("records.zip", b"not a zip", "application/zip"))],
+    )
+    assert response.status_code == 400
+    assert "Invalid ZIP archive" in response.json()["error"]
+
+
+def test_batch_upload_rejects_oversized_zip(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "BATCH_MAX_ZIP_MEMBER_BYTES", 1024)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("record.pdf", b"\0" * 10_000)
+
+    response = client.post(
+        "/medical-records/batch",
+        files=[("files", ("records.zip", archive.getvalue(), "application/zip"))],
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"] == (
+        "ZIP archive 'records.zip' contains a PDF larger than 1024 bytes"
+    )
+
+
+def test_stream_upload_emits_stages_alerts_and_result(client: TestClient) -> None:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records/stream",
+            files={"file": (pdf_path.name, file_obj, "application/pdf")},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [
+        (
+            message.split("\n")[0].removeprefix("event: "),
+            json.loads(message.split("\n")[1].removeprefix("data: ")),
+        )
+        for message in response.text.strip().split("\n\n")
+    ]
+    names = [name for name, _ in messages]
+    assert names[0] == "stage"
+    assert names.index("alert") < names.index("result") == len(names) - 1
+    assert {"stage": "extracting_text", "page": 1, "pages": 1} in [
+        data for _, data in messages
+    ]
+    alert = next(data for name, data in messages if name == "alert")
+    assert alert["event"] == "test"
+    result = messages[-1][1]
+    assert result["events"][0]["description"] == "test"
+    assert client.get("/events").json()["total"] == 1
+
+
+def test_stream_upload_removes_spooled_file_without_reading_the_stream(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    spooled_paths: list[Path] = []
+
+    class NotStreamingJobsService:
+        async def stream(self, upload, filename, build_repository, session_factory):
+            # Stands in for a response whose body never gets to the pipeline.
+            spooled_paths.append(upload.path)
+            return
+            yield
+
+    app.dependency_overrides[get_ingestion_jobs_service] = NotStreamingJobsService
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records/stream",
+            files={"file": (pdf_path.name, file_obj, "application/pdf")},
+        )
+
+    assert response.status_code == 200
+    assert len(spooled_paths) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reuploading_same_pdf_reuses_previous_extraction(
+    client: TestClient, db_session
+) -> None:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    payloads = []
+    for _ in range(2):
+        with pdf_path.open("rb") as file_obj:
+            response = client.post(
+                "/medical-records",
+                files={"file": (pdf_path.name, file_obj, "application/pdf")},
+            )
+        assert response.status_code == 200
+        payloads.append(response.json())
+
+    first, second = payloads
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["medical_record_id"] != first["medical_record_id"]
+    assert [event["description"] for event in second["events"]] == [
+        event["description"] for event in first["events"]
+    ]
+    assert db_session.query(MedicalRecord).count() == 2
+    assert client.get("/events").json()["total"] == 2
+
+
+def test_reuploading_same_pdf_extracts_with_current_event_types(
+    client: TestClient,
+) -> None:
+    extraction_calls: list[list[str]] = []
+
+    class RecordingEventsExtractionService(StubEventsExtractionService):
+        async def extract_events(self, text, alert_types, on_alert=None):
+            extraction_calls.append([alert_type.id for alert_type in alert_types])
+            return await super().extract_events(text, alert_types)
+
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: RecordingEventsExtractionService
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+
+    def upload():
+        with pdf_path.open("rb") as file_obj:
+            return client.post(
+                "/medical-records",
+                files={"file": (pdf_path.name, file_obj, "application/pdf")},
+            )
+
+    assert upload().status_code == 200
+    response = client.post(
+        "/event-types",
+        json={"name": "Lab Visits", "description": "Future lab appointments"},
+    )
+    assert response.status_code == 201
+    response = upload()
+
+    assert response.status_code == 200
+    assert response.json()["cache_hit"] is True
+    assert len(extraction_calls) == 2
+    assert "lab_visits" not in extraction_calls[0]
+    assert "lab_visits" in extraction_calls[1]
+
+
+def test_extracted_text_survives_failed_event_extraction(client: TestClient) -> None:
+    text_extraction_calls: list[Path] = []
+
+    class CountingTextExtractionService(StubTextExtractionService):
+        async def extract_text_from_pdf(self, pdf_path: Path, on_page=None) -> str:
+            text_extraction_calls.append(pdf_path)
+            return await super().extract_text_from_pdf(pdf_path, on_page=on_page)
+
+    class FailingEventsExtractionService(StubEventsExtractionService):
+        async def extract_events(self, text, alert_types, on_alert=None):
+            raise InvalidRequest("Unable to extract medical alerts")
+
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+
+    def upload():
+        with pdf_path.open("rb") as file_obj:
+            return client.post(
+                "/medical-records",
+                files={"file": (pdf_path.name, file_obj, "application/pdf")},
+            )
+
+    app.dependency_overrides[
+        get_text_extraction_service
+    ] = lambda: CountingTextExtractionService()
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: FailingEventsExtractionService
+    assert upload().status_code == 400
+
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: StubEventsExtractionService
+    response = upload()
+    assert response.status_code == 200
+    assert response.json()["events"]
+    assert len(text_extraction_calls) == 1
+    assert not text_extraction_calls[0].exists()
+
+
+class RecordingStorage(StubStorage):
+    def __init__(self) -> None:
+        self.stored: list[str] = []
+        self.removed: list[str] = []
+
+    def put_path(self, key, path, content_type="application/octet-stream") -> None:
+        assert path.exists()
+        self.stored.append(key)
+
+    def remove_object(self, key: str) -> None:
+        self.removed.append(key)
+
+    def remove_objects(self, keys: list[str]) -> list[str]:
+        self.removed.extend(keys)
+        return []
+
+
+def test_storage_upload_overlaps_extraction(client: TestClient) -> None:
+    storage = RecordingStorage()
+
+    class WaitForStorageEventsExtractionService(StubEventsExtractionService):
+        async def extract_events(self, text, alert_types, on_alert=None):
+            # Only finishes if the upload already started in the background.
+            for _ in range(100):
+                if storage.stored:
+                    return await super().extract_events(text, alert_types)
+                await asyncio.sleep(0.01)
+            raise AssertionError("storage upload did not start during extraction")
+
+    app.dependency_overrides[get_storage] = lambda: storage
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: WaitForStorageEventsExtractionService
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records",
+            files={"file": (pdf_path.name, file_obj, "application/pdf")},
+        )
+
+    assert response.status_code == 200
+    record_id = response.json()["medical_record_id"]
+    assert storage.stored == [f"{record_id}/{pdf_path.name}"]
+    assert storage.removed == []
+
+
+def test_failed_extraction_removes_stored_object(
+    client: TestClient, db_session
+) -> None:
+    storage = RecordingStorage()
+
+    class FailingEventsExtractionService(StubEventsExtractionService):
+        async def extract_events(self, text, alert_types, on_alert=None):
+            raise InvalidRequest("Unable to extract medical alerts")
+
+    app.dependency_overrides[get_storage] = lambda: storage
+    app.dependency_overrides[
+        get_events_extraction_service_factory
+    ] = lambda: FailingEventsExtractionService
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    with pdf_path.open("rb") as file_obj:
+        response = client.post(
+            "/medical-records",
+            files={"file": (pdf_path.name, file_obj, "application/pdf")},
+        )
+
+    assert response.status_code == 400
+    assert storage.removed == storage.stored
+    assert len(storage.removed) == 1
+    assert db_session.query(MedicalRecord).count() == 0
+
+
+def _upload(client: TestClient, filename: str) -> str:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    response = client.post(
+        "/medical-records",
+        files={"file": (filename, pdf_path.read_bytes(), "application/pdf")},
+    )
+    assert response.status_code == 200
+    return response.json()["medical_record_id"]
+
+
+def test_delete_medical_record_removes_stored_object(client: TestClient) -> None:
+    storage = RecordingStorage()
+    app.dependency_overrides[get_storage] = lambda: storage
+    record_id = _upload(client, "a.pdf")
+
+    assert client.delete(f"/medical-records/{record_id}").status_code == 204
+    assert storage.removed == [f"{record_id}/a.pdf"]
+
+
+def test_bulk_delete_by_ids_and_filter(
+    client: TestClient, db_session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        medical_records_repository._settings, "MEDICAL_RECORDS_DELETE_BATCH_SIZE", 2
+    )
+    storage = RecordingStorage()
+    app.dependency_overrides[get_storage] = lambda: storage
+    clinic_ids = [_upload(client, f"clinic-{i}.pdf") for i in range(3)]
+    other_ids = [_upload(client, f"other-{i}.pdf") for i in range(2)]
+
+    response = client.post(
+        "/medical-records/bulk-delete", json={"filename_prefix": "clinic-"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 3}
+    assert sorted(storage.removed) == sorted(
+        f"{record_id}/clinic-{i}.pdf" for i, record_id in enumerate(clinic_ids)
+    )
+
+    response = client.post("/medical-records/bulk-delete", json={"ids": [other_ids[0]]})
+    assert response.json() == {"deleted": 1}
+    assert [str(record.id) for record in db_session.query(MedicalRecord)] == [
+        other_ids[1]
+    ]
+    assert db_session.query(Event).count() == 1
+    assert client.get("/events").json()["total"] == 1
+
+
+def test_bulk_delete_requires_ids_or_filter(client: TestClient) -> None:
+    response = client.post("/medical-records/bulk-delete", json={})
+    assert response.status_code == 400
+    assert "Provide ids or at least one filter" in response.json()["error"]
+
+
+def _seed_records(db_session, filenames: list[str]) -> list[str]:
+    """Insert records one minute apart, oldest first, with i events for the i-th."""
+    record_ids = [uuid.uuid4() for _ in filenames]
+    created = datetime(2026, 1, 1, 12, 0)
+    db_session.execute(
+        insert(MedicalRecord),
+        [
+            {
+                "id": record_id,
+                "filename": filename,
+                "created_time": created + timedelta(minutes=i),
+            }
+            for i, (record_id, filename) in enumerate(zip(record_ids, filenames))
+        ],
+    )
+    events = [
+        {
+            "medical_record_id": record_id,
+            "event_type_id": "routine_exams",
+            "event": "exam",
+            "date": date.today(),
+        }
+        for i, record_id in enumerate(record_ids)
+        for _ in range(i)
+    ]
+    if events:
+        db_session.execute(insert(Event), events)
+    db_session.commit()
+    return [str(record_id) for record_id in record_ids]
+
+
+def test_list_medical_records_pages_newest_first_with_event_counts(
+    client: TestClient, db_session
+) -> None:
+    record_ids = _seed_records(db_session, [f"record-{i}.pdf" for i in range(5)])
+
+    pages = []
+    params: dict = {"page_size": 2}
+    while True:
+        payload = client.get("/medical-records", params=params).json()
+        pages.append(payload["medical_records"])
+        if not payload["next_cursor"]:
+            break
+        params["cursor"] = payload["next_cursor"]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    records = [record for page in pages for record in page]
+    assert [record["id"] for record in records] == record_ids[::-1]
+    assert [record["event_count"] for record in records] == [4, 3, 2, 1, 0]
+
+
+def test_list_medical_records_filters_by_filename(
+    client: TestClient, db_session
+) -> None:
+    _seed_records(
+        db_session, ["clinic-a.pdf", "clinic-b.pdf", "other_clinic.pdf", "lab.pdf"]
+    )
+
+    def filenames(**params) -> list[str]:
+        response = client.get("/medical-records", params=params)
+        assert response.status_code == 200
+        return [record["filename"] for record in response.json()["medical_records"]]
+
+    assert filenames(filename_prefix="clinic-") == ["clinic-b.pdf", "clinic-a.pdf"]
+    assert filenames(filename_contains="CLINIC") == [
+        "other_clinic.pdf",
+        "clinic-b.pdf",
+        "clinic-a.pdf",
+    ]
+    # "_" is matched literally, not as a LIKE wildcard.
+    assert filenames(filename_contains="r_c") == ["other_clinic.pdf"]
+
+
+def test_list_medical_records_rejects_invalid_cursor(client: TestClient) -> None:
+    response = client.get("/medical-records", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid cursor"
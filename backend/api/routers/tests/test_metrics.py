@@ -0,0 +1,57 @@
+import asyncio
+
+from db.session_creator import (ASYNC_POOL_CHECKOUT_WAIT_METRIC,
+                                POOL_CHECKOUT_WAIT_METRIC,
+                                InstrumentedAsyncQueuePool,
+                                InstrumentedQueuePool, create_async_db_engine,
+                                create_db_engine, get_engine,
+                                get_session_maker)
+from fastapi.testclient import TestClient
+from utils.metrics import metrics
+
+
+def test_session_maker_is_shared_across_calls() -> None:
+    assert get_session_maker() is get_session_maker()
+    assert get_session_maker().kw["bind"] is get_engine()
+
+
+def test_instrumented_pool_records_checkout_wait() -> None:
+    engine = create_db_engine(
+        "sqlite+pysqlite:///:memory:", poolclass=InstrumentedQueuePool
+    )
+    before = metrics.timing(POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"]
+    with engine.connect():
+        pass
+    after = metrics.timing(POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"]
+    engine.dispose()
+    assert after == before + 1
+
+
+def test_async_pool_records_checkout_wait_separately() -> None:
+    engine = create_async_db_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=InstrumentedAsyncQueuePool
+    )
+    sync_before = metrics.timing(POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"]
+    async_before = metrics.timing(ASYNC_POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"]
+
+    async def checkout() -> None:
+        async with engine.connect():
+            pass
+        await engine.dispose()
+
+    asyncio.run(checkout())
+    assert metrics.timing(POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"] == sync_before
+    assert (
+        metrics.timing(ASYNC_POOL_CHECKOUT_WAIT_METRIC).snapshot()["count"]
+        == async_before + 1
+    )
+
+
+def test_get_db_pool_stats_reports_sync_and_async_pools(client: TestClient) -> None:
+    response = client.get("/metrics/db-pool")
+    assert response.status_code == 200
+    payload = response.json()
+    assert set(payload) == {"sync", "async"}
+    for pool in payload.values():
+        assert pool["pool_class"] == "NullPool"
+        assert "count" in pool["checkout_wait"]
@@ -0,0 +1,60 @@
+import uuid
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import pytest
+from api.conftest import StatementCounter
+from db.models.event import Event
+from db.models.medical_record import MedicalRecord
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+def _seed(session: Session, records: int, events_per_record: int = 2) -> None:
+    event_type_ids = ["vaccine_expirations", "routine_exams"]
+    for _ in range(records):
+        medical_record_id = uuid.uuid4()
+        session.execute(
+            insert(MedicalRecord), [{"id": medical_record_id, "filename": "a.pdf"}]
+        )
+        session.execute(
+            insert(Event),
+            [
+                {
+                    "medical_record_id": medical_record_id,
+                    "event_type_id": event_type_ids[i % len(event_type_ids)],
+                    "event": f"event-{i}",
+                    "date": date.today() + timedelta(days=i + 1),
+                }
+                for i in range(events_per_record)
+            ],
+        )
+    session.commit()
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/events", {"page_size": 100}),
+        ("/medical-records", {}),
+        ("/event-types", {}),
+    ],
+)
+def test_statement_count_does_not_grow_with_result_size(
+    client: TestClient,
+    db_session: Session,
+    count_statements: Callable[[], StatementCounter],
+    path: str,
+    params: dict,
+) -> None:
+    counts = []
+    for records in (2, 20):
+        _seed(db_session, records)
+        with count_statements() as counter:
+            response = client.get(path, params=params)
+        assert response.status_code == 200
+        counts.append(counter.count)
+
+    small, large = counts
+    assert large <= small
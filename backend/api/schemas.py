@@ -1,8 +1,9 @@
 import datetime
 import uuid
 from datetime import date
+from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class EventTypeBase(BaseModel):
@@ -26,8 +27,20 @@ class UpcomingEvent(BaseModel):
 class EventsResponse(BaseModel):
     events: list[UpcomingEvent]
     total: int | None = None
+    # False when `total` came from the count cache or a planner estimate
+    total_is_exact: bool | None = None
     page: int | None = None
     page_size: int | None = None
+    next_cursor: str | None = None
+
+
+class MedicalRecordUploadResponse(EventsResponse):
+    medical_record_id: uuid.UUID | None = None
+    # True when the PDF's extracted text was reused from an earlier upload of
+    # the same file, so OCR was skipped. It says nothing about the LLM step: its
+    # result can come from the extraction cache either way, e.g. for another
+    # PDF with the same text.
+    cache_hit: bool = False
 
 
 class UploadAlert(BaseModel):
@@ -44,7 +57,86 @@ class MedicalRecord(BaseModel):
     id: uuid.UUID
     filename: str
     created_time: datetime.datetime
+    event_count: int
 
 
 class MedicalRecordResponse(BaseModel):
     medical_records: list[MedicalRecord]
+    page_size: int
+    # Pass back as `cursor` to get the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class MedicalRecordsDeleteRequest(BaseModel):
+    """Selects the records to delete; all given criteria must match."""
+
+    ids: list[uuid.UUID] | None = None
+    filename_prefix: str | None = None
+    created_before: datetime.datetime | None = None
+
+    @model_validator(mode="after")
+    def require_selection(self) -> "MedicalRecordsDeleteRequest":
+        if not (self.ids or self.filename_prefix or self.created_before):
+            raise ValueError("Provide ids or at least one filter")
+        return self
+
+
+class MedicalRecordsDeleteResponse(BaseModel):
+    deleted: int
+
+
+class IngestionStage(str, Enum):
+    QUEUED = "queued"
+    EXTRACTING_TEXT = "extracting_text"
+    EXTRACTING_EVENTS = "extracting_events"
+    UPLOADING = "uploading"
+    SAVING = "saving"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionJob(BaseModel):
+    id: uuid.UUID
+    filename: str
+    stage: IngestionStage = IngestionStage.QUEUED
+    progress: float = 0.0
+    events: list[UpcomingEvent] = []
+    medical_record_id: uuid.UUID | None = None
+    # See MedicalRecordUploadResponse.cache_hit
+    cache_hit: bool | None = None
+    error: str | None = None
+    created_time: datetime.datetime
+    updated_time: datetime.datetime
+
+
+class BatchIngestionResponse(BaseModel):
+    jobs: list[IngestionJob]
+
+
+class TimingStats(BaseModel):
+    count: int
+    total_seconds: float
+    avg_seconds: float
+    max_seconds: float
+
+
+class DatabasePoolStats(BaseModel):
+    pool_class: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    checkout_wait: TimingStats
+
+
+class DatabasePoolsStats(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    sync: DatabasePoolStats
+    # Serialized as "async", which is reserved in Python
+    async_: DatabasePoolStats = Field(alias="async")
+
+
+class MetricsResponse(BaseModel):
+    counters: dict[str, int]
+    timings: dict[str, TimingStats]
@@ -0,0 +1,99 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from api.schemas import EventType as EventTypeSchema
+from api.services.baml_client.types import AlertType
+from db.models.event_type import EventType
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from utils.metrics import metrics
+from utils.settings import AppSettings
+
+_settings = AppSettings()
+
+
+@dataclass(frozen=True)
+class EventTypesSnapshot:
+    version: int
+    event_types: dict[str, EventTypeSchema]
+    alert_types: list[AlertType]
+
+
+class EventTypesCache:
+    """In-process copy of the event type taxonomy and its BAML alert types.
+
+    Writes through `AsyncEventTypesRepository` call `invalidate`, which bumps the
+    version so a load racing with the write is not stored. Changes made by other
+    processes are picked up once the snapshot is older than `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._version = 0
+        self._snapshot: EventTypesSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, session: Session) -> EventTypesSnapshot:
+        snapshot, version = self._lookup()
+        if snapshot is None:
+            snapshot = self._store(_load_snapshot(session, version))
+        return snapshot
+
+    async def get_async(self, session: AsyncSession) -> EventTypesSnapshot:
+        snapshot, version = self._lookup()
+        if snapshot is None:
+            snapshot = self._store(await session.run_sync(_load_snapshot, version))
+        return snapshot
+
+    def _lookup(self) -> tuple[EventTypesSnapshot | None, int]:
+        with self._lock:
+            snapshot = self._snapshot
+            version = self._version
+            fresh = time.monotonic() - self._loaded_at < self.ttl_seconds
+        if snapshot is not None and fresh:
+            metrics.increment("event_types.cache.hit")
+            return snapshot, version
+        metrics.increment("event_types.cache.miss")
+        return None, version
+
+    def _store(self, snapshot: EventTypesSnapshot) -> EventTypesSnapshot:
+        with self._lock:
+            if self._version == snapshot.version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+
+def _load_snapshot(session: Session, version: int) -> EventTypesSnapshot:
+    rows: list[EventType] = session.query(EventType).all()
+    event_types = {
+        row.id: EventTypeSchema(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            is_deletable=row.is_deletable,
+        )
+        for row in rows
+    }
+    return EventTypesSnapshot(
+        version=version,
+        event_types=event_types,
+        alert_types=[
+            AlertType(
+                id=event_type.id,
+                name=event_type.name,
+                description=event_type.description,
+            )
+            for event_type in event_types.values()
+        ],
+    )
+
+
+event_types_cache = EventTypesCache(ttl_seconds=_settings.EVENT_TYPES_CACHE_TTL_SECONDS)
@@ -1,11 +1,60 @@
+import asyncio
+import re
 import traceback
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
 from api.error_handlers import InvalidRequest
-from api.services.baml_client import b
+from api.repositories.extraction_results_repository import \
+    ExtractionResultsRepository
+from api.services.baml_client import stream_types
+from api.services.baml_client.async_client import b
 from api.services.baml_client.types import AlertType, MedicalAlert
-from db.models.event_type import EventType
+from api.services.extraction_cache_service import (ExtractionCacheService,
+                                                   extraction_cache_key)
+from api.services.llm_rate_limiter import LlmRateLimiter, llm_rate_limiter
+from api.services.text_chunking import split_into_chunks
+from baml_py import Collector
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from utils.metrics import metrics
+from utils.settings import AppSettings
+
+_settings = AppSettings()
+
+# First client tried by MedicalAlertsFallback in clients.baml
+PRIMARY_LLM_CLIENT = "OpenAIResponsesStable"
+# Rough prompt + completion budget on top of the document
+PROMPT_OVERHEAD_TOKENS = 2_000
+CHARS_PER_TOKEN = 4
+
+AlertCallback = Callable[[MedicalAlert], None]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + PROMPT_OVERHEAD_TOKENS
+
+
+def _normalize_event(event: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", event.lower()).split())
+
+
+def _alert_key(alert: MedicalAlert) -> tuple[str, str, str]:
+    return (alert.type.id, alert.date, _normalize_event(alert.event))
+
+
+def merge_alerts(chunk_alerts: list[list[MedicalAlert]]) -> list[MedicalAlert]:
+    """Concatenate per-chunk alerts, dropping repeats from overlapping chunks."""
+    seen: set[tuple[str, str, str]] = set()
+    merged: list[MedicalAlert] = []
+    for alerts in chunk_alerts:
+        for alert in alerts:
+            key = _alert_key(alert)
+            if key not in seen:
+                seen.add(key)
+                merged.append(alert)
+    return merged
 
 
 class EventsExtractionService(ABC):
@@ -13,31 +62,157 @@ class EventsExtractionService(ABC):
         self.session = session
 
     @abstractmethod
-    def extract_events(
-        self, text: str, event_types: list[EventType]
+    async def extract_events(
+        self,
+        text: str,
+        alert_types: list[AlertType],
+        on_alert: AlertCallback | None = None,
     ) -> list[MedicalAlert]:
+        """Return the alerts found in `text`.
+
+        When `on_alert` is given it is called once per alert as soon as the
+        alert is known, before the full list is returned.
+        """
         raise NotImplementedError
 
 
 class BamlEventsExtractionService(EventsExtractionService):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        rate_limiter: LlmRateLimiter = llm_rate_limiter,
+        chunk_max_tokens: int = _settings.LLM_CHUNK_MAX_TOKENS,
+        chunk_overlap_tokens: int = _settings.LLM_CHUNK_OVERLAP_TOKENS,
+    ):
         super().__init__(session)
+        self.cache = ExtractionCacheService(ExtractionResultsRepository(session))
+        self.rate_limiter = rate_limiter
+        self.chunk_max_tokens = chunk_max_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
 
-    def extract_events(
-        self, text: str, event_types: list[EventType]
+    async def extract_events(
+        self,
+        text: str,
+        alert_types: list[AlertType],
+        on_alert: AlertCallback | None = None,
     ) -> list[MedicalAlert]:
-        alert_types = [
-            AlertType(
-                id=alert_type.id,
-                name=alert_type.name,
-                description=alert_type.description,
-            )
-            for alert_type in event_types
-        ]
+        cache_key = extraction_cache_key(
+            text, alert_types, self.chunk_max_tokens, self.chunk_overlap_tokens
+        )
+        cached_alerts = await run_in_threadpool(self.cache.get, cache_key)
+        if cached_alerts is not None:
+            if on_alert:
+                for alert in cached_alerts:
+                    on_alert(alert)
+            return cached_alerts
+        chunks = split_into_chunks(
+            text,
+            max_chars=self.chunk_max_tokens * CHARS_PER_TOKEN,
+            overlap_chars=self.chunk_overlap_tokens * CHARS_PER_TOKEN,
+        )
+        metrics.increment("llm.chunks", len(chunks))
+        emit = _deduplicating(on_alert) if on_alert else None
         try:
-            return b.ExtractMedicalAlerts(document=text, alert_types=alert_types)
+            alerts = merge_alerts(
+                await asyncio.gather(
+                    *(self._call_llm(chunk, alert_types, emit) for chunk in chunks)
+                )
+            )
         except Exception as exc:
             traceback.print_exc()
             raise InvalidRequest(
                 "Unable to extract medical alerts from the uploaded document. Please try again shortly."
             ) from exc
+        await run_in_threadpool(self.cache.set, cache_key, alerts)
+        return alerts
+
+    async def _call_llm(
+        self,
+        text: str,
+        alert_types: list[AlertType],
+        on_alert: AlertCallback | None = None,
+    ) -> list[MedicalAlert]:
+        estimated_tokens = estimate_tokens(text)
+        collector = Collector(name="extract-medical-alerts")
+        async with self.rate_limiter.limit(PRIMARY_LLM_CLIENT, estimated_tokens):
+            try:
+                if on_alert:
+                    return await self._stream_llm(
+                        text, alert_types, collector, on_alert
+                    )
+                return await b.ExtractMedicalAlerts(
+                    document=text,
+                    alert_types=alert_types,
+                    baml_options={"collector": collector},
+                )
+            finally:
+                self._record_usage(collector, estimated_tokens)
+
+    async def _stream_llm(
+        self,
+        text: str,
+        alert_types: list[AlertType],
+        collector: Collector,
+        on_alert: AlertCallback,
+    ) -> list[MedicalAlert]:
+        stream = b.stream.ExtractMedicalAlerts(
+            document=text,
+            alert_types=alert_types,
+            baml_options={"collector": collector},
+        )
+        emitted = 0
+        async for partial in stream:
+            # Every item but the last is followed by another one, so it is done
+            # being generated; the last may still be mid-field.
+            for item in partial[emitted:-1]:
+                alert = _complete_alert(item)
+                if alert is None:
+                    break
+                on_alert(alert)
+                emitted += 1
+        alerts = await stream.get_final_response()
+        # `on_alert` drops repeats, so anything already streamed is not resent.
+        for alert in alerts:
+            on_alert(alert)
+        return alerts
+
+    def _record_usage(self, collector: Collector, estimated_tokens: int) -> None:
+        # The primary client was charged an estimate up front; settle the
+        # difference and charge any fallback clients that were actually called.
+        function_log = collector.last
+        calls = function_log.calls if function_log else []
+        primary_reserved = False
+        for call in calls:
+            usage = call.usage
+            tokens = (
+                (usage.input_tokens or 0) + (usage.output_tokens or 0) if usage else 0
+            )
+            if call.client_name == PRIMARY_LLM_CLIENT and not primary_reserved:
+                primary_reserved = True
+                self.rate_limiter.record_usage(
+                    call.client_name, requests=0, tokens=tokens - estimated_tokens
+                )
+            else:
+                self.rate_limiter.record_usage(
+                    call.client_name, requests=1, tokens=tokens
+                )
+
+
+def _complete_alert(partial: stream_types.MedicalAlert) -> MedicalAlert | None:
+    try:
+        return MedicalAlert.model_validate(partial.model_dump())
+    except ValidationError:
+        return None
+
+
+def _deduplicating(on_alert: AlertCallback) -> AlertCallback:
+    """Wrap `on_alert` so alerts repeated by overlapping chunks fire once."""
+    seen: set[tuple[str, str, str]] = set()
+
+    def emit(alert: MedicalAlert) -> None:
+        key = _alert_key(alert)
+        if key not in seen:
+            seen.add(key)
+            on_alert(alert)
+
+    return emit
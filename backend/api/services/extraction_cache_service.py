@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+import time
+
+from api.repositories.extraction_results_repository import \
+    ExtractionResultsRepository
+from api.services.baml_client import __version__ as baml_version
+from api.services.baml_client.inlinedbaml import get_baml_files
+from api.services.baml_client.types import AlertType, MedicalAlert
+from utils.metrics import metrics
+from utils.settings import AppSettings
+from utils.ttl_cache import TTLCache
+
+_settings = AppSettings()
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _prompt_version() -> str:
+    baml_files = get_baml_files()
+    return _sha256(
+        baml_version
+        + baml_files["document_extractor.baml"]
+        + baml_files["clients.baml"]
+    )
+
+
+# Changes whenever the prompt, client configuration or BAML runtime changes.
+PROMPT_VERSION = _prompt_version()
+
+memory_cache: TTLCache[str, list[MedicalAlert]] = TTLCache(
+    max_entries=_settings.EXTRACTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=_settings.EXTRACTION_CACHE_MEMORY_TTL_SECONDS,
+)
+
+
+_purge_lock = threading.Lock()
+_last_purge = float("-inf")
+
+
+def extraction_cache_key(
+    text: str,
+    alert_types: list[AlertType],
+    chunk_max_tokens: int,
+    chunk_overlap_tokens: int,
+) -> str:
+    taxonomy = sorted(
+        (alert_type.id, alert_type.name, alert_type.description)
+        for alert_type in alert_types
+    )
+    return _sha256(
+        ":".join(
+            (
+                _sha256(text),
+                _sha256(json.dumps(taxonomy)),
+                PROMPT_VERSION,
+                # Chunk boundaries change what the LLM sees, and so the alerts.
+                f"{chunk_max_tokens}/{chunk_overlap_tokens}",
+            )
+        )
+    )
+
+
+class ExtractionCacheService:
+    """Two-tier cache of LLM extraction results: in-process LRU, then Postgres.
+
+    `invalidate` deletes durable entries for every worker but can only clear
+    this process's memory tier. Other workers keep serving what they already
+    hold until it expires, i.e. for up to `EXTRACTION_CACHE_MEMORY_TTL_SECONDS`.
+    Prompt changes need no invalidation, as `PROMPT_VERSION` is in the key.
+    """
+
+    def __init__(
+        self,
+        repository: ExtractionResultsRepository,
+        memory: TTLCache[str, list[MedicalAlert]] = memory_cache,
+        ttl_seconds: int = _settings.EXTRACTION_CACHE_TTL_SECONDS,
+        purge_interval_seconds: int = _settings.EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS,
+    ):
+        self.repository = repository
+        self.memory = memory
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+
+    def get(self, cache_key: str) -> list[MedicalAlert] | None:
+        alerts = self.memory.get(cache_key)
+        if alerts is not None:
+            metrics.increment("extraction_cache.memory.hit")
+            return alerts
+        alerts = self.repository.get_alerts(cache_key)
+        if alerts is not None:
+            metrics.increment("extraction_cache.durable.hit")
+            self.memory.set(cache_key, alerts)
+            return alerts
+        metrics.increment("extraction_cache.miss")
+        return None
+
+    def set(self, cache_key: str, alerts: list[MedicalAlert]) -> None:
+        self.memory.set(cache_key, alerts)
+        self.repository.save_alerts(cache_key, alerts, ttl_seconds=self.ttl_seconds)
+        self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        # Reads skip expired rows; this keeps them from piling up. At most one
+        # purge per interval per process, piggybacked on writes.
+        global _last_purge
+        with _purge_lock:
+            now = time.monotonic()
+            if now - _last_purge < self.purge_interval_seconds:
+                return
+            _last_purge = now
+        purged = self.repository.purge_expired()
+        metrics.increment("extraction_cache.durable.purged", purged)
+
+    def invalidate(self, cache_key: str | None = None) -> None:
+        if cache_key is None:
+            self.memory.clear()
+        else:
+            self.memory.invalidate(cache_key)
+        self.repository.delete_alerts(cache_key)
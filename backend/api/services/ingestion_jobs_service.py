@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timezone
+
+from api.error_handlers import InvalidRequest
+from api.repositories.medical_records_repository import \
+    MedicalRecordsRepository
+from api.schemas import IngestionJob, IngestionStage
+from api.services.ingestion_progress import (EventStreamListener,
+                                             IngestionListener)
+from sqlalchemy.orm import Session, sessionmaker
+from utils.uploads import SpooledUpload
+
+MedicalRecordsRepositoryFactory = Callable[[Session], MedicalRecordsRepository]
+
+STAGE_PROGRESS: dict[IngestionStage, float] = {
+    IngestionStage.QUEUED: 0.0,
+    IngestionStage.EXTRACTING_TEXT: 0.1,
+    IngestionStage.EXTRACTING_EVENTS: 0.5,
+    IngestionStage.UPLOADING: 0.8,
+    IngestionStage.SAVING: 0.9,
+    IngestionStage.COMPLETED: 1.0,
+    IngestionStage.FAILED: 1.0,
+}
+
+FINISHED_STAGES = (IngestionStage.COMPLETED, IngestionStage.FAILED)
+
+UNEXPECTED_ERROR = "Unexpected error. Please try again later."
+
+
+class JobListener(IngestionListener):
+    """Mirrors pipeline progress onto a job, interpolating across OCR pages."""
+
+    def __init__(self, jobs_service: "IngestionJobsService", job_id: uuid.UUID):
+        self.jobs_service = jobs_service
+        self.job_id = job_id
+
+    def on_stage(self, stage: IngestionStage) -> None:
+        self.jobs_service._update(self.job_id, stage=stage)
+
+    def on_page(self, page_number: int, page_count: int) -> None:
+        start = STAGE_PROGRESS[IngestionStage.EXTRACTING_TEXT]
+        end = STAGE_PROGRESS[IngestionStage.EXTRACTING_EVENTS]
+        self.jobs_service._update(
+            self.job_id,
+            stage=IngestionStage.EXTRACTING_TEXT,
+            progress=start + (end - start) * page_number / page_count,
+        )
+
+
+class IngestionJobsService:
+    """Runs medical record ingestion in the background with bounded concurrency.
+
+    Job state lives in memory, so it is only visible to the worker process that
+    accepted the upload and is lost on restart.
+    """
+
+    def __init__(self, max_concurrent_jobs: int, max_retained_jobs: int = 1000):
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._max_retained_jobs = max_retained_jobs
+        self._jobs: OrderedDict[uuid.UUID, IngestionJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create_job(self, filename: str) -> IngestionJob:
+        now = datetime.now(timezone.utc)
+        job = IngestionJob(
+            id=uuid.uuid4(), filename=filename, created_time=now, updated_time=now
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished_jobs()
+        return job.model_copy()
+
+    def get_job(self, job_id: uuid.UUID) -> IngestionJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                raise InvalidRequest(f"Ingestion job {job_id} not found")
+            return job.model_copy()
+
+    async def run_job(
+        self,
+        job_id: uuid.UUID,
+        upload: SpooledUpload,
+        build_repository: MedicalRecordsRepositoryFactory,
+        session_factory: sessionmaker[Session],
+    ) -> None:
+        async with self._semaphore:
+            try:
+                with session_factory() as session:
+                    await self._process(job_id, upload, build_repository(session))
+            finally:
+                upload.cleanup()
+
+    async def run_batch(
+        self,
+        jobs: list[tuple[uuid.UUID, SpooledUpload]],
+        build_repository: MedicalRecordsRepositoryFactory,
+        session_factory: sessionmaker[Session],
+    ) -> None:
+        """Process a batch of jobs, each in its own session.
+
+        Jobs still run concurrently under the service-wide limit, so one file's
+        OCR overlaps another's LLM call.
+        """
+        try:
+            await asyncio.gather(
+                *(
+                    self.run_job(job_id, upload, build_repository, session_factory)
+                    for job_id, upload in jobs
+                )
+            )
+        finally:
+            for _, upload in jobs:
+                upload.cleanup()
+
+    async def _process(
+        self,
+        job_id: uuid.UUID,
+        upload: SpooledUpload,
+        repository: MedicalRecordsRepository,
+    ) -> None:
+        filename = self.get_job(job_id).filename
+        try:
+            result = await repository.process_medical_record(
+                upload,
+                filename=filename,
+                listener=JobListener(self, job_id),
+            )
+        except InvalidRequest as exc:
+            self._update(job_id, stage=IngestionStage.FAILED, error=exc.message)
+        except Exception:
+            traceback.print_exc()
+            self._update(
+                job_id,
+                stage=IngestionStage.FAILED,
+                error=UNEXPECTED_ERROR,
+            )
+        else:
+            self._update(
+                job_id,
+                stage=IngestionStage.COMPLETED,
+                events=result.events,
+                medical_record_id=result.medical_record_id,
+                cache_hit=result.cache_hit,
+            )
+
+    async def stream(
+        self,
+        upload: SpooledUpload,
+        filename: str,
+        build_repository: MedicalRecordsRepositoryFactory,
+        session_factory: sessionmaker[Session],
+    ) -> AsyncIterator[str]:
+        """Process `upload` while yielding its progress as server-sent events.
+
+        Emits `stage` and `alert` messages as the pipeline advances, then one
+        `result` or `error` message. Shares the job concurrency limit. The
+        caller owns `upload` and removes it once the response is over.
+        """
+        listener = EventStreamListener()
+
+        async def pipeline() -> None:
+            try:
+                async with self._semaphore:
+                    with session_factory() as session:
+                        result = await build_repository(session).process_medical_record(
+                            upload, filename=filename, listener=listener
+                        )
+                listener.emit("result", result)
+            except InvalidRequest as exc:
+                listener.emit("error", {"error": exc.message})
+            except Exception:
+                traceback.print_exc()
+                listener.emit("error", {"error": UNEXPECTED_ERROR})
+            finally:
+                listener.close()
+
+        listener.on_stage(IngestionStage.QUEUED)
+        async for message in listener.stream(pipeline()):
+            yield message
+
+    def _update(self, job_id: uuid.UUID, stage: IngestionStage, **changes) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            job.stage = stage
+            job.progress = STAGE_PROGRESS[stage]
+            job.updated_time = datetime.now(timezone.utc)
+            for field, value in changes.items():
+                setattr(job, field, value)
+
+    def _evict_finished_jobs(self) -> None:
+        excess = len(self._jobs) - self._max_retained_jobs
+        if excess <= 0:
+            return
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.stage in FINISHED_STAGES
+        ]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
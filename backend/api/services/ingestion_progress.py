@@ -0,0 +1,67 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Coroutine
+from typing import Any
+
+from api.schemas import IngestionStage
+from api.services.baml_client.types import MedicalAlert
+from pydantic import BaseModel
+
+
+class IngestionListener:
+    """Receives progress notifications from the ingestion pipeline.
+
+    Every hook is a no-op by default so listeners only override what they use.
+    """
+
+    def on_stage(self, stage: IngestionStage) -> None:
+        pass
+
+    def on_page(self, page_number: int, page_count: int) -> None:
+        pass
+
+    def on_alert(self, alert: MedicalAlert) -> None:
+        pass
+
+
+class EventStreamListener(IngestionListener):
+    """Turns pipeline notifications into server-sent event messages."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def on_stage(self, stage: IngestionStage) -> None:
+        self.emit("stage", {"stage": stage.value})
+
+    def on_page(self, page_number: int, page_count: int) -> None:
+        self.emit(
+            "stage",
+            {
+                "stage": IngestionStage.EXTRACTING_TEXT.value,
+                "page": page_number,
+                "pages": page_count,
+            },
+        )
+
+    def on_alert(self, alert: MedicalAlert) -> None:
+        self.emit("alert", alert)
+
+    def emit(self, event: str, data: BaseModel | dict[str, Any]) -> None:
+        payload = (
+            data.model_dump_json() if isinstance(data, BaseModel) else json.dumps(data)
+        )
+        self._queue.put_nowait(f"event: {event}\ndata: {payload}\n\n")
+
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    async def stream(self, pipeline: Coroutine[Any, Any, None]) -> AsyncIterator[str]:
+        """Run `pipeline` and yield messages until it calls `close`."""
+        task = asyncio.create_task(pipeline)
+        try:
+            while (message := await self._queue.get()) is not None:
+                yield message
+        finally:
+            if not task.done():
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from utils.metrics import metrics
+from utils.settings import AppSettings
+
+_settings = AppSettings()
+
+
+class TokenBucket:
+    """Per-minute budget that refills continuously.
+
+    Reservations are taken immediately and may overdraw the bucket; the caller
+    is told how long to wait until the debt has refilled. This lets usage that
+    is only known after a call (e.g. actual tokens) be charged retroactively.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self._available = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(
+                self.capacity, self._available + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self.rate
+
+
+class LlmRateLimiter:
+    """Process-wide concurrency cap plus RPM/TPM buckets per BAML client."""
+
+    def __init__(self, max_concurrency: int, limits: dict[str, dict[str, int]]):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests = {
+            client: TokenBucket(limit["rpm"]) for client, limit in limits.items()
+        }
+        self._tokens = {
+            client: TokenBucket(limit["tpm"]) for client, limit in limits.items()
+        }
+
+    @asynccontextmanager
+    async def limit(
+        self, client_name: str, estimated_tokens: int
+    ) -> AsyncIterator[None]:
+        # Wait for the client's budget before taking a concurrency slot, so a
+        # throttled client does not hold slots that other clients could use.
+        wait = max(
+            self._reserve(self._requests, client_name, 1),
+            self._reserve(self._tokens, client_name, estimated_tokens),
+        )
+        if wait > 0:
+            metrics.observe("llm.rate_limit.wait", wait)
+            await asyncio.sleep(wait)
+        async with self._semaphore:
+            yield
+
+    def record_usage(self, client_name: str, requests: int, tokens: int) -> None:
+        """Charge usage that was not reserved up front, such as fallback calls."""
+        self._reserve(self._requests, client_name, requests)
+        self._reserve(self._tokens, client_name, tokens)
+
+    @staticmethod
+    def _reserve(
+        buckets: dict[str, TokenBucket], client_name: str, amount: float
+    ) -> float:
+        bucket = buckets.get(client_name)
+        return bucket.reserve(amount) if bucket else 0.0
+
+
+llm_rate_limiter = LlmRateLimiter(
+    max_concurrency=_settings.LLM_MAX_CONCURRENCY, limits=_settings.LLM_RATE_LIMITS
+)
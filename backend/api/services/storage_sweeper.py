@@ -0,0 +1,128 @@
+import asyncio
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from db.models.medical_record import MedicalRecord
+from minio.datatypes import Object
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+from utils.metrics import metrics
+from utils.storage import MinioClient
+
+# Postgres advisory lock id held for the duration of a sweep, so that only one
+# worker process sweeps at a time
+SWEEPER_LOCK_ID = 7_214_290_135
+
+
+class OrphanedObjectsSweeper:
+    """Removes stored PDFs whose medical record no longer exists.
+
+    The bucket is listed `page_size` keys at a time and each page is checked
+    against the database with one query. Objects younger than
+    `min_age_seconds` are skipped: ingestion uploads the PDF before the record
+    row is committed.
+
+    Every worker runs a sweeper, but on Postgres a pass only proceeds in the
+    worker that takes the advisory lock; the others skip it.
+    """
+
+    def __init__(
+        self,
+        storage: MinioClient,
+        session_factory: async_sessionmaker[AsyncSession],
+        page_size: int,
+        min_age_seconds: float,
+    ):
+        self.storage = storage
+        self.session_factory = session_factory
+        self.page_size = page_size
+        self.min_age_seconds = min_age_seconds
+
+    async def sweep(self) -> int:
+        """Run one pass over the bucket and return how many objects were removed.
+
+        Returns 0 without listing anything when another worker holds the lock.
+        """
+        async with self.session_factory() as session:
+            # The lock belongs to the connection, so hold one for the whole pass
+            # without keeping a transaction open.
+            await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            if not await self._try_lock(session):
+                metrics.increment("storage.sweeper.skipped")
+                return 0
+            try:
+                return await self._sweep(session)
+            finally:
+                await self._unlock(session)
+
+    async def _sweep(self, session: AsyncSession) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.min_age_seconds)
+        removed = 0
+        start_after: str | None = None
+        while True:
+            page = await run_in_threadpool(
+                self.storage.list_objects, start_after=start_after, limit=self.page_size
+            )
+            orphans = await self._find_orphans(
+                session,
+                [
+                    stored_object
+                    for stored_object in page
+                    if stored_object.last_modified is None
+                    or stored_object.last_modified < cutoff
+                ],
+            )
+            if orphans:
+                failed = await run_in_threadpool(self.storage.remove_objects, orphans)
+                removed += len(orphans) - len(failed)
+            if len(page) < self.page_size:
+                break
+            start_after = page[-1].object_name
+        metrics.increment("storage.sweeper.removed", removed)
+        return removed
+
+    async def run(self, interval_seconds: float) -> None:
+        """Sweep every `interval_seconds` until cancelled."""
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                traceback.print_exc()
+            await asyncio.sleep(interval_seconds)
+
+    async def _try_lock(self, session: AsyncSession) -> bool:
+        # Other databases only back single-process setups such as the tests.
+        if session.bind.dialect.name != "postgresql":
+            return True
+        return await session.scalar(select(func.pg_try_advisory_lock(SWEEPER_LOCK_ID)))
+
+    async def _unlock(self, session: AsyncSession) -> None:
+        if session.bind.dialect.name == "postgresql":
+            await session.scalar(select(func.pg_advisory_unlock(SWEEPER_LOCK_ID)))
+
+    async def _find_orphans(
+        self, session: AsyncSession, stored_objects: list[Object]
+    ) -> list[str]:
+        record_ids: dict[str, uuid.UUID] = {}
+        for stored_object in stored_objects:
+            record_id = MedicalRecord.parse_storage_uri(stored_object.object_name)
+            # Keys that don't start with a record id weren't written by ingestion.
+            if record_id is not None:
+                record_ids[stored_object.object_name] = record_id
+        if not record_ids:
+            return []
+
+        existing = set(
+            await session.scalars(
+                select(MedicalRecord.id).where(
+                    MedicalRecord.id.in_(set(record_ids.values()))
+                )
+            )
+        )
+        return [
+            key for key, record_id in record_ids.items() if record_id not in existing
+        ]
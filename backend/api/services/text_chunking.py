@@ -0,0 +1,46 @@
+from api.services.text_extraction_service import PAGE_SEPARATOR
+
+# Coarsest boundary first: pages, paragraphs, lines, then words.
+SEPARATORS = (PAGE_SEPARATOR, "\n\n", "\n", " ")
+
+
+def _split_units(text: str, limit: int, separators: tuple[str, ...]) -> list[str]:
+    if len(text) <= limit:
+        return [text]
+    if not separators:
+        return [text[start : start + limit] for start in range(0, len(text), limit)]
+    separator, *rest = separators
+    parts = text.split(separator)
+    units: list[str] = []
+    for index, part in enumerate(parts):
+        if index < len(parts) - 1:
+            part += separator
+        if part:
+            units.extend(_split_units(part, limit, tuple(rest)))
+    return units
+
+
+def split_into_chunks(text: str, max_chars: int, overlap_chars: int = 0) -> list[str]:
+    """Split `text` on the coarsest boundaries that keep chunks under `max_chars`.
+
+    Each chunk after the first starts with the last `overlap_chars` of the
+    previous one so statements that straddle a boundary are seen whole.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    body_limit = max(max_chars - overlap_chars, 1)
+    bodies: list[str] = []
+    current = ""
+    for unit in _split_units(text, body_limit, SEPARATORS):
+        if current and len(current) + len(unit) > body_limit:
+            bodies.append(current)
+            current = ""
+        current += unit
+    if current:
+        bodies.append(current)
+    if overlap_chars <= 0:
+        return bodies
+    return [bodies[0]] + [
+        bodies[index - 1][-overlap_chars:] + body
+        for index, body in enumerate(bodies[1:], start=1)
+    ]
@@ -1,22 +1,125 @@
-import io
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path
 from pypdf import PdfReader
 from pytesseract import image_to_string
+from utils.metrics import metrics
+from utils.settings import AppSettings
+
+# Pages whose text layer is shorter than this are rasterized and OCR'd.
+MIN_TEXT_LAYER_LENGTH = 10
+# Bump whenever a change to extraction can alter the produced text, so cached
+# texts from the previous extractor are no longer reused.
+EXTRACTOR_VERSION = "pypdf-tesseract-2"
+# Joins page texts so downstream chunking can split on page boundaries.
+PAGE_SEPARATOR = "\f"
+
+_settings = AppSettings()
+_ocr_executor: ProcessPoolExecutor | None = None
+
+# Called with (pages done, page count) each time a page's text is ready.
+PageCallback = Callable[[int, int], None]
+
+
+@dataclass
+class TextExtractionResult:
+    text: str
+    page_count: int
+    rendered_pages: int
+
+    @property
+    def skipped_pages(self) -> int:
+        return self.page_count - self.rendered_pages
+
+
+def read_text_layer(pdf_path: Path) -> list[str]:
+    # Passing an open file keeps pypdf from reading the whole PDF into memory.
+    with open(pdf_path, "rb") as pdf_file:
+        reader = PdfReader(pdf_file)
+        return [page.extract_text() or "" for page in reader.pages]
+
+
+def ocr_page(pdf_path: Path, page_number: int) -> str:
+    images = convert_from_path(
+        pdf_path, fmt="png", first_page=page_number, last_page=page_number
+    )
+    return image_to_string(images[0]) if images else ""
+
+
+def get_ocr_executor() -> ProcessPoolExecutor:
+    global _ocr_executor
+    if _ocr_executor is None:
+        max_workers = _settings.OCR_MAX_WORKERS or os.cpu_count()
+        _ocr_executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _ocr_executor
+
+
+def shutdown_ocr_executor() -> None:
+    global _ocr_executor
+    if _ocr_executor is not None:
+        _ocr_executor.shutdown(wait=False, cancel_futures=True)
+        _ocr_executor = None
 
 
 class TextExtractionService:
-    def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
-        text_from_metadata = ""
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        images = convert_from_bytes(pdf_bytes, fmt="png")
-        for i, _ in enumerate(reader.pages, start=1):
-            text = reader.pages[i - 1].extract_text() or ""
-            if len(text) < 10:
-                text = image_to_string(images[i - 1])
-            text_from_metadata += text
-        return text_from_metadata
+    """Runs PDF rendering and OCR in a worker pool so the event loop stays free.
+
+    Pages without a usable text layer are OCR'd concurrently, at most
+    `page_parallelism` at a time per document, and reassembled in page order.
+    """
+
+    def __init__(self, executor: Executor | None = None, page_parallelism: int = 4):
+        self.executor = executor
+        self.page_parallelism = page_parallelism
+
+    async def extract(
+        self, pdf_path: Path, on_page: PageCallback | None = None
+    ) -> TextExtractionResult:
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_ocr_executor()
+        semaphore = asyncio.Semaphore(self.page_parallelism)
+        pages_done = 0
+
+        async def page_text(page_number: int, text: str) -> str:
+            nonlocal pages_done
+            if len(text) < MIN_TEXT_LAYER_LENGTH:
+                async with semaphore:
+                    text = await loop.run_in_executor(
+                        executor, ocr_page, pdf_path, page_number
+                    )
+            pages_done += 1
+            if on_page:
+                on_page(pages_done, len(text_layer))
+            return text
+
+        text_layer = await loop.run_in_executor(executor, read_text_layer, pdf_path)
+        texts = await asyncio.gather(
+            *(
+                page_text(page_number, text)
+                for page_number, text in enumerate(text_layer, start=1)
+            )
+        )
+        return TextExtractionResult(
+            text=PAGE_SEPARATOR.join(texts),
+            page_count=len(text_layer),
+            rendered_pages=sum(
+                len(text) < MIN_TEXT_LAYER_LENGTH for text in text_layer
+            ),
+        )
+
+    async def extract_text_from_pdf(
+        self, pdf_path: Path, on_page: PageCallback | None = None
+    ) -> str:
+        result = await self.extract(pdf_path, on_page=on_page)
+        metrics.increment("ocr.pages.rendered", result.rendered_pages)
+        metrics.increment("ocr.pages.skipped", result.skipped_pages)
+        return result.text
 
 
 def get_text_extraction_service() -> TextExtractionService:
-    return TextExtractionService()
+    return TextExtractionService(page_parallelism=_settings.OCR_PAGE_PARALLELISM)
@@ -0,0 +1,62 @@
+import asyncio
+import uuid
+from datetime import date, timedelta
+
+from api.repositories.events_repository import (AsyncEventsRepository,
+                                                events_count_cache)
+from db.models.event import Event
+from db.models.medical_record import MedicalRecord
+from db.session_creator import get_async_session_maker, to_async_db_uri
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+def test_async_db_uri_swaps_driver() -> None:
+    assert (
+        to_async_db_uri("postgresql+psycopg2://user:secret@db:5432/alerts")
+        == "postgresql+asyncpg://user:secret@db:5432/alerts"
+    )
+    assert (
+        to_async_db_uri("sqlite+pysqlite:////tmp/app.sqlite3")
+        == "sqlite+aiosqlite:////tmp/app.sqlite3"
+    )
+
+
+def test_async_events_repository_pages_and_counts(db_session: Session) -> None:
+    medical_record_id = uuid.uuid4()
+    db_session.execute(
+        insert(MedicalRecord), [{"id": medical_record_id, "filename": "a.pdf"}]
+    )
+    db_session.execute(
+        insert(Event),
+        [
+            {
+                "medical_record_id": medical_record_id,
+                "event_type_id": "routine_exams",
+                "event": f"event-{i}",
+                "date": date.today() + timedelta(days=i),
+            }
+            for i in range(5)
+        ],
+    )
+    db_session.commit()
+
+    async def read_pages():
+        async with get_async_session_maker()() as session:
+            repository = AsyncEventsRepository(session=session)
+            first_page, cursor = await repository.get_events(page_size=3)
+            second_page, last_cursor = await repository.get_events(
+                page_size=3, cursor=cursor
+            )
+            return (
+                first_page + second_page,
+                last_cursor,
+                await repository.count_events(),
+            )
+
+    events_count_cache.clear()
+    events, last_cursor, count = asyncio.run(read_pages())
+    assert [event.description for event in events] == [f"event-{i}" for i in range(5)]
+    assert events[0].medical_record_filename == "a.pdf"
+    assert last_cursor is None
+    assert count == (5, True)
@@ -0,0 +1,22 @@
+import json
+import sys
+
+import pytest
+
+from evaluation import benchmark_event_inserts
+
+
+def test_benchmark_runs_on_default_in_memory_database(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["benchmark_event_inserts.py", "--records", "2", "--events-per-record", "5"],
+    )
+
+    benchmark_event_inserts.main()
+
+    results = json.loads(capsys.readouterr().out)
+    assert set(results) == {"orm_add_all", "bulk_insert", "speedup"}
+    assert results["bulk_insert"]["events_per_second"] > 0
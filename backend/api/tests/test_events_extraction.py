@@ -0,0 +1,299 @@
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from api.repositories.extraction_results_repository import \
+    ExtractionResultsRepository
+from api.services import events_extraction_service
+from api.services.baml_client import stream_types
+from api.services.baml_client.types import AlertType, MedicalAlert
+from api.services.event_types_cache import event_types_cache
+from api.services.events_extraction_service import BamlEventsExtractionService
+from api.services.extraction_cache_service import (ExtractionCacheService,
+                                                   memory_cache)
+from api.services.llm_rate_limiter import LlmRateLimiter, TokenBucket
+from api.services.text_chunking import split_into_chunks
+from db.models.extraction_result import ExtractionResult
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from utils.ttl_cache import TTLCache
+
+
+class FakeBamlClient:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ExtractMedicalAlerts(
+        self, document: str, alert_types: list[AlertType], baml_options: dict
+    ) -> list[MedicalAlert]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [MedicalAlert(type=alert_types[0], event=document, date="2030-01-01")]
+
+
+@pytest.fixture
+def fake_baml(monkeypatch: pytest.MonkeyPatch) -> Generator[FakeBamlClient, None, None]:
+    fake = FakeBamlClient()
+    monkeypatch.setattr(events_extraction_service, "b", fake)
+    memory_cache.clear()
+    yield fake
+    memory_cache.clear()
+
+
+def _alert_types(session: Session) -> list[AlertType]:
+    return event_types_cache.get(session).alert_types
+
+
+def _extract(
+    service: BamlEventsExtractionService, text: str, alert_types: list[AlertType]
+) -> list[MedicalAlert]:
+    return asyncio.run(service.extract_events(text=text, alert_types=alert_types))
+
+
+def test_repeated_extraction_is_served_from_cache(
+    db_session: Session, fake_baml: FakeBamlClient
+) -> None:
+    alert_types = _alert_types(db_session)
+    service = BamlEventsExtractionService(session=db_session)
+
+    first = _extract(service, "record", alert_types)
+    second = _extract(service, "record", list(reversed(alert_types)))
+
+    assert fake_baml.calls == 1
+    assert second == first
+
+
+def test_durable_tier_survives_memory_eviction(
+    db_session: Session, fake_baml: FakeBamlClient
+) -> None:
+    alert_types = _alert_types(db_session)
+    _extract(BamlEventsExtractionService(session=db_session), "record", alert_types)
+    memory_cache.clear()
+
+    alerts = _extract(
+        BamlEventsExtractionService(session=db_session), "record", alert_types
+    )
+
+    assert fake_baml.calls == 1
+    assert alerts[0].event == "record"
+
+
+def test_taxonomy_change_and_invalidation_bypass_cache(
+    db_session: Session, fake_baml: FakeBamlClient
+) -> None:
+    alert_types = _alert_types(db_session)
+    service = BamlEventsExtractionService(session=db_session)
+
+    _extract(service, "record", alert_types)
+    _extract(service, "record", alert_types[:2])
+    assert fake_baml.calls == 2
+
+    service.cache.invalidate()
+    _extract(service, "record", alert_types)
+    assert fake_baml.calls == 3
+
+
+def test_concurrent_extractions_respect_global_limit(
+    db_session: Session, fake_baml: FakeBamlClient
+) -> None:
+    alert_types = _alert_types(db_session)
+
+    async def run_all() -> None:
+        limiter = LlmRateLimiter(max_concurrency=2, limits={})
+        service = BamlEventsExtractionService(session=db_session, rate_limiter=limiter)
+        service.cache.get = lambda cache_key: None
+        service.cache.set = lambda cache_key, alerts: None
+        await asyncio.gather(
+            *(
+                service.extract_events(text=f"record-{i}", alert_types=alert_types)
+                for i in range(6)
+            )
+        )
+
+    asyncio.run(run_all())
+
+    assert fake_baml.calls == 6
+    assert fake_baml.max_in_flight == 2
+
+
+def test_split_into_chunks_prefers_page_boundaries_and_overlaps() -> None:
+    pages = ["a" * 30, "b" * 30, "c" * 30]
+    text = "\f".join(pages)
+
+    chunks = split_into_chunks(text, max_chars=45, overlap_chars=5)
+
+    assert len(chunks) == 3
+    assert all(len(chunk) <= 45 for chunk in chunks)
+    assert chunks[0] == pages[0] + "\f"
+    assert chunks[1].startswith("aaaa\f" + pages[1])
+    assert split_into_chunks("short", max_chars=45) == ["short"]
+
+
+def test_long_document_is_extracted_per_chunk_and_merged(
+    db_session: Session, fake_baml: FakeBamlClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    alert_types = _alert_types(db_session)
+
+    async def extract_same_alert(document, alert_types, baml_options):
+        fake_baml.calls += 1
+        return [
+            MedicalAlert(
+                type=alert_types[0], event="Rabies booster.", date="2030-01-01"
+            ),
+            MedicalAlert(type=alert_types[0], event=document[:5], date="2030-02-01"),
+        ]
+
+    monkeypatch.setattr(fake_baml, "ExtractMedicalAlerts", extract_same_alert)
+    service = BamlEventsExtractionService(
+        session=db_session, chunk_max_tokens=4, chunk_overlap_tokens=0
+    )
+    text = "\f".join(["page one text", "page two text", "page three text"])
+
+    alerts = _extract(service, text, alert_types)
+
+    assert fake_baml.calls == 3
+    assert [alert.event for alert in alerts] == [
+        "Rabies booster.",
+        "page ",
+    ]
+
+
+class FakeAlertStream:
+    def __init__(self, partials: list[list], final: list[MedicalAlert], log: list):
+        self.partials = partials
+        self.final = final
+        self.log = log
+
+    async def __aiter__(self):
+        for partial in self.partials:
+            self.log.append(f"partial:{len(partial)}")
+            yield partial
+
+    async def get_final_response(self) -> list[MedicalAlert]:
+        self.log.append("final")
+        return self.final
+
+
+def test_streaming_extraction_emits_alerts_as_they_complete(
+    db_session: Session, fake_baml: FakeBamlClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    alert_types = _alert_types(db_session)
+    log: list = []
+    alert_type = alert_types[0]
+    first = MedicalAlert(type=alert_type, event="Rabies booster", date="2030-01-01")
+    second = MedicalAlert(type=alert_type, event="Dental cleaning", date="2030-02-01")
+    partial_second = stream_types.MedicalAlert(
+        type=alert_type.model_dump(), event="Dental"
+    )
+
+    class FakeStreamClient:
+        def ExtractMedicalAlerts(self, document, alert_types, baml_options):
+            return FakeAlertStream(
+                partials=[
+                    [],
+                    [first.model_copy()],
+                    [first.model_copy(), partial_second],
+                    [first.model_copy(), second.model_copy()],
+                ],
+                final=[first, second],
+                log=log,
+            )
+
+    monkeypatch.setattr(fake_baml, "stream", FakeStreamClient(), raising=False)
+    service = BamlEventsExtractionService(session=db_session)
+
+    alerts = asyncio.run(
+        service.extract_events(
+            text="record",
+            alert_types=alert_types,
+            on_alert=lambda alert: log.append(alert.event),
+        )
+    )
+
+    assert alerts == [first, second]
+    assert fake_baml.calls == 0
+    assert log == [
+        "partial:0",
+        "partial:1",
+        "partial:2",
+        "Rabies booster",
+        "partial:2",
+        "final",
+        "Dental cleaning",
+    ]
+
+
+def test_token_bucket_makes_callers_wait_once_budget_is_spent() -> None:
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    # Overdrawn usage charged after the fact pushes later callers further out.
+    bucket.reserve(9)
+    assert bucket.reserve(0) == pytest.approx(10.0, abs=0.05)
+
+
+def test_throttled_client_does_not_hold_concurrency_slot() -> None:
+    limiter = LlmRateLimiter(
+        max_concurrency=1, limits={"throttled": {"rpm": 60, "tpm": 1_000_000}}
+    )
+    finished: list[str] = []
+
+    async def call(client_name: str) -> None:
+        async with limiter.limit(client_name, estimated_tokens=1):
+            finished.append(client_name)
+
+    async def run_all() -> None:
+        # Spend the throttled client's budget so its next call waits ~1s.
+        limiter.record_usage("throttled", requests=60, tokens=0)
+        throttled = asyncio.create_task(call("throttled"))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(call("unthrottled"), timeout=0.5)
+        assert not throttled.done()
+        throttled.cancel()
+
+    asyncio.run(run_all())
+
+    assert finished == ["unthrottled"]
+
+
+def test_chunking_settings_are_part_of_the_cache_key(
+    db_session: Session, fake_baml: FakeBamlClient
+) -> None:
+    alert_types = _alert_types(db_session)
+
+    for chunk_max_tokens in (8_000, 8_000, 4_000):
+        service = BamlEventsExtractionService(
+            session=db_session, chunk_max_tokens=chunk_max_tokens
+        )
+        _extract(service, "record", alert_types)
+
+    assert fake_baml.calls == 2
+
+
+def test_saving_alerts_upserts_and_purges_expired_entries(
+    db_session: Session,
+) -> None:
+    repository = ExtractionResultsRepository(session=db_session)
+    alert = MedicalAlert(
+        type=AlertType(id="routine_exams", name="ROUTINE_EXAMS", description="Exams"),
+        event="exam",
+        date="2030-01-01",
+    )
+    repository.save_alerts("expired", [alert], ttl_seconds=-1)
+    repository.save_alerts("live", [], ttl_seconds=60)
+
+    cache = ExtractionCacheService(
+        repository,
+        memory=TTLCache(max_entries=10, ttl_seconds=60),
+        purge_interval_seconds=0,
+    )
+    cache.set("live", [alert])
+
+    assert db_session.scalars(select(ExtractionResult.cache_key)).all() == ["live"]
+    assert repository.get_alerts("live") == [alert]
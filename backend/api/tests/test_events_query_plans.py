@@ -0,0 +1,217 @@
+import asyncio
+import os
+import uuid
+from collections.abc import Generator
+from datetime import date, timedelta
+
+import pytest
+from api.repositories.events_repository import (AsyncEventsRepository,
+                                                _count_statement,
+                                                _event_filters,
+                                                _events_page_statement,
+                                                events_count_cache,
+                                                events_cursor)
+from db.models.base import Base
+from db.models.event import Event
+from db.models.event_type import EventType
+from db.models.medical_record import MedicalRecord
+from db.session_creator import get_async_engine, get_async_session_maker
+from sqlalchemy import Select, create_engine, event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+SEEDED_EVENTS = 20_000
+POSTGRES_SEEDED_EVENTS = 50_000
+EVENT_TYPE_IDS = ["vaccine_expirations", "routine_exams", "follow_up_appointments"]
+
+
+def _seed_rows(medical_record_id: uuid.UUID, count: int) -> list[dict]:
+    """Events spread over two years and cycling through `EVENT_TYPE_IDS`."""
+    return [
+        {
+            "medical_record_id": medical_record_id,
+            "event_type_id": EVENT_TYPE_IDS[i % len(EVENT_TYPE_IDS)],
+            "event": f"event-{i}",
+            "date": date.today() + timedelta(days=i % 730),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def large_events_table(db_session: Session) -> Session:
+    events_count_cache.clear()
+    medical_record_id = uuid.uuid4()
+    db_session.execute(
+        insert(MedicalRecord), [{"id": medical_record_id, "filename": "large.pdf"}]
+    )
+    db_session.execute(insert(Event), _seed_rows(medical_record_id, SEEDED_EVENTS))
+    db_session.commit()
+    db_session.execute(text("ANALYZE"))
+    return db_session
+
+
+def _events_query_plans(session: Session, **filters) -> list[str]:
+    """Run `get_events` and return the SQLite plan of each query on `events`."""
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM events" in statement:
+            statements.append((statement, parameters))
+
+    async def run_queries() -> None:
+        async with get_async_session_maker()() as async_session:
+            repository = AsyncEventsRepository(session=async_session)
+            await repository.count_events(**filters)
+            await repository.get_events(page_size=20, **filters)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        asyncio.run(run_queries())
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    connection = session.connection().connection
+    return [
+        " | ".join(
+            row[-1]
+            for row in connection.execute(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).fetchall()
+        )
+        for statement, parameters in statements
+    ]
+
+
+def test_date_range_queries_use_date_index(large_events_table: Session) -> None:
+    count_plan, page_plan = _events_query_plans(
+        large_events_table, end_date=date.today() + timedelta(days=30)
+    )
+
+    assert "USING COVERING INDEX ix_events_date_id" in count_plan
+    assert "USING INDEX ix_events_date_id" in page_plan
+    assert "TEMP B-TREE" not in page_plan
+
+
+def test_type_filtered_queries_use_type_date_index(
+    large_events_table: Session,
+) -> None:
+    count_plan, page_plan = _events_query_plans(
+        large_events_table, event_type_ids=["routine_exams"]
+    )
+
+    assert "USING COVERING INDEX ix_events_event_type_id_date_id" in count_plan
+    assert "USING INDEX ix_events_event_type_id_date_id" in page_plan
+    assert "TEMP B-TREE" not in page_plan
+
+
+@pytest.fixture(scope="module")
+def postgres_events_table() -> Generator[Engine, None, None]:
+    """A scratch schema on the `TEST_DATABASE_URL` server with seeded events."""
+    schema = f"query_plans_{uuid.uuid4().hex[:8]}"
+    admin_engine = create_engine(
+        os.environ["TEST_DATABASE_URL"], isolation_level="AUTOCOMMIT"
+    )
+    with admin_engine.connect() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(
+        os.environ["TEST_DATABASE_URL"],
+        connect_args={"options": f"-csearch_path={schema},public"},
+    )
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            medical_record_id = uuid.uuid4()
+            session.execute(
+                insert(EventType),
+                [
+                    {"id": type_id, "name": type_id.upper(), "description": type_id}
+                    for type_id in EVENT_TYPE_IDS
+                ],
+            )
+            session.execute(
+                insert(MedicalRecord),
+                [{"id": medical_record_id, "filename": "large.pdf"}],
+            )
+            session.execute(
+                insert(Event), _seed_rows(medical_record_id, POSTGRES_SEEDED_EVENTS)
+            )
+            session.commit()
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            # Index-only scans need the visibility map VACUUM sets.
+            connection.execute(text("VACUUM ANALYZE"))
+        yield engine
+    finally:
+        engine.dispose()
+        with admin_engine.connect() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin_engine.dispose()
+
+
+def _postgres_plan_nodes(engine: Engine, statement: Select) -> list[dict]:
+    """Return every node of the Postgres plan for `statement`, outermost first."""
+    compiled = statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as connection:
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+
+    nodes: list[dict] = []
+    pending = [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop(0)
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+def _scans(nodes: list[dict], index_name: str) -> set[str]:
+    return {node["Node Type"] for node in nodes if node.get("Index Name") == index_name}
+
+
+@pytest.mark.postgres
+def test_postgres_date_range_queries_use_date_index(
+    postgres_events_table: Engine,
+) -> None:
+    filters = _event_filters(
+        event_type_ids=None,
+        medical_record_ids=None,
+        start_date=None,
+        end_date=date.today() + timedelta(days=30),
+    )
+    cursor = events_cursor.encode(date.today() + timedelta(days=7), uuid.UUID(int=0))
+
+    count_nodes = _postgres_plan_nodes(postgres_events_table, _count_statement(filters))
+    assert _scans(count_nodes, "ix_events_date_id") == {"Index Only Scan"}
+
+    for page_cursor in (None, cursor):
+        page_nodes = _postgres_plan_nodes(
+            postgres_events_table, _events_page_statement(1, 20, page_cursor, filters)
+        )
+        assert _scans(page_nodes, "ix_events_date_id") == {"Index Scan"}
+        assert "Sort" not in {node["Node Type"] for node in page_nodes}
+
+
+@pytest.mark.postgres
+def test_postgres_type_filtered_queries_use_type_date_index(
+    postgres_events_table: Engine,
+) -> None:
+    filters = _event_filters(
+        event_type_ids=["routine_exams"],
+        medical_record_ids=None,
+        start_date=None,
+        end_date=None,
+    )
+
+    count_nodes = _postgres_plan_nodes(postgres_events_table, _count_statement(filters))
+    assert _scans(count_nodes, "ix_events_event_type_id_date_id") == {"Index Only Scan"}
+
+    page_nodes = _postgres_plan_nodes(
+        postgres_events_table, _events_page_statement(1, 20, None, filters)
+    )
+    assert _scans(page_nodes, "ix_events_event_type_id_date_id") == {"Index Scan"}
+    assert "Sort" not in {node["Node Type"] for node in page_nodes}
@@ -0,0 +1,32 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from api.error_handlers import InvalidRequest
+from api.repositories.keyset_cursor import KeysetCursor
+
+
+def test_keyset_cursor_round_trips_sort_key_and_id() -> None:
+    row_id = uuid.uuid4()
+    created_time = datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    cursors = KeysetCursor("created_time", datetime.fromisoformat)
+
+    token = cursors.encode(created_time, row_id)
+
+    assert "=" not in token
+    assert cursors.decode(token) == (created_time, row_id)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not base64!",
+        "e30",  # {} has no sort key
+        KeysetCursor("created_time", datetime.fromisoformat).encode(
+            date(2026, 1, 1), uuid.uuid4()
+        ),
+    ],
+)
+def test_keyset_cursor_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(InvalidRequest, match="Invalid cursor"):
+        KeysetCursor("date", date.fromisoformat).decode(token)
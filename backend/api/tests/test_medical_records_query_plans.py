@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime, timedelta
+
+from api.repositories.medical_records_repository import \
+    _medical_records_page_statement
+from db.models.medical_record import MedicalRecord
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+
+def test_listing_page_uses_created_time_index(db_session: Session) -> None:
+    created = datetime(2026, 1, 1)
+    db_session.execute(
+        insert(MedicalRecord),
+        [
+            {
+                "id": uuid.uuid4(),
+                "filename": f"record-{i}.pdf",
+                "created_time": created + timedelta(seconds=i),
+            }
+            for i in range(5_000)
+        ],
+    )
+    db_session.commit()
+    db_session.execute(text("ANALYZE"))
+
+    statement = _medical_records_page_statement(page_size=20, cursor=None, filters=[])
+    compiled = statement.compile(
+        dialect=db_session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    plan = " | ".join(
+        row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    )
+
+    assert "USING INDEX ix_medical_records_created_time_id" in plan
+    assert "USING COVERING INDEX ix_events_medical_record_id" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+from minio.datatypes import Object
+from minio.deleteobjects import DeleteError
+from utils import storage
+from utils.metrics import metrics
+from utils.settings import AppSettings
+from utils.storage import MinioClient, close_storage, get_storage_client
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.bucket_checks = 0
+        self.buckets: set[str] = set()
+        self.objects: dict[str, bytes] = {}
+
+    def bucket_exists(self, bucket: str) -> bool:
+        self.bucket_checks += 1
+        return bucket in self.buckets
+
+    def make_bucket(self, bucket: str) -> None:
+        self.buckets.add(bucket)
+
+    def fput_object(self, bucket, key, file_path, content_type) -> None:
+        self.objects[key] = Path(file_path).read_bytes()
+
+    def remove_objects(self, bucket, delete_object_list):
+        for delete_object in delete_object_list:
+            if self.objects.pop(delete_object.name, None) is None:
+                yield DeleteError("NoSuchKey", None, delete_object.name, None)
+
+    def list_objects(self, bucket, recursive, start_after):
+        for key in sorted(self.objects):
+            if start_after is None or key > start_after:
+                yield Object(bucket, key)
+
+
+def test_bucket_is_checked_once_and_puts_are_timed(tmp_path: Path) -> None:
+    metrics.reset()
+    fake = FakeMinio()
+    client = MinioClient(fake, "docs")
+    first, second = tmp_path / "first.pdf", tmp_path / "second.pdf"
+    first.write_bytes(b"first")
+    second.write_bytes(b"second")
+
+    client.put_path("a.pdf", first)
+    client.put_path("b.pdf", second)
+
+    assert fake.bucket_checks == 1
+    assert fake.buckets == {"docs"}
+    assert fake.objects == {"a.pdf": b"first", "b.pdf": b"second"}
+    assert metrics.snapshot()["timings"]["storage.put_path"]["count"] == 2
+
+
+def test_storage_client_is_created_once_per_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created: list[FakeMinio] = []
+
+    def from_env(settings: AppSettings) -> MinioClient:
+        created.append(FakeMinio())
+        return MinioClient(created[-1], settings.MINIO_BUCKET)
+
+    monkeypatch.setattr(MinioClient, "from_env", staticmethod(from_env))
+    monkeypatch.setattr(storage, "_storage", None)
+    settings = AppSettings()
+    try:
+        first = get_storage_client(settings)
+        second = get_storage_client(settings)
+    finally:
+        close_storage()
+
+    assert first is second
+    assert len(created) == 1
+    assert created[0].bucket_checks == 1
+
+
+def test_remove_objects_reports_failed_keys_and_list_objects_pages() -> None:
+    fake = FakeMinio()
+    fake.objects = {key: b"" for key in ("a.pdf", "b.pdf", "c.pdf")}
+    client = MinioClient(fake, "docs")
+
+    assert [o.object_name for o in client.list_objects(limit=2)] == ["a.pdf", "b.pdf"]
+    assert [o.object_name for o in client.list_objects(start_after="b.pdf")] == [
+        "c.pdf"
+    ]
+    assert client.remove_objects(["a.pdf", "missing.pdf", "c.pdf"]) == ["missing.pdf"]
+    assert fake.objects == {"b.pdf": b""}
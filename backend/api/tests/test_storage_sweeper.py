@@ -0,0 +1,84 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from api.services.storage_sweeper import OrphanedObjectsSweeper
+from db.models.medical_record import MedicalRecord
+from db.session_creator import get_async_session_maker
+from minio.datatypes import Object
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from utils.metrics import metrics
+
+
+class ListingStorage:
+    def __init__(self, objects: dict[str, datetime]) -> None:
+        self.objects = objects
+        self.list_calls = 0
+
+    def list_objects(self, start_after: str | None = None, limit: int = 1000):
+        self.list_calls += 1
+        keys = [
+            key for key in sorted(self.objects) if not start_after or key > start_after
+        ]
+        return [
+            Object("docs", key, last_modified=self.objects[key]) for key in keys[:limit]
+        ]
+
+    def remove_objects(self, keys: list[str]) -> list[str]:
+        for key in keys:
+            del self.objects[key]
+        return []
+
+
+def test_sweeper_removes_only_old_objects_without_a_record(
+    db_session: Session,
+) -> None:
+    kept_id = uuid.uuid4()
+    db_session.execute(insert(MedicalRecord), [{"id": kept_id, "filename": "a.pdf"}])
+    db_session.commit()
+
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    kept = MedicalRecord.build_storage_uri(kept_id, "a.pdf")
+    orphans = [MedicalRecord.build_storage_uri(uuid.uuid4(), "b.pdf") for _ in range(3)]
+    in_flight = MedicalRecord.build_storage_uri(uuid.uuid4(), "c.pdf")
+    storage = ListingStorage(
+        {
+            kept: old,
+            **{key: old for key in orphans},
+            in_flight: datetime.now(timezone.utc),
+            "exports/report.csv": old,
+        }
+    )
+    sweeper = OrphanedObjectsSweeper(
+        storage=storage,
+        session_factory=get_async_session_maker(),
+        page_size=2,
+        min_age_seconds=3600,
+    )
+
+    assert asyncio.run(sweeper.sweep()) == 3
+    assert set(storage.objects) == {kept, in_flight, "exports/report.csv"}
+    assert storage.list_calls == 4
+
+
+def test_sweeper_skips_pass_when_another_worker_holds_the_lock() -> None:
+    class LockedOutSweeper(OrphanedObjectsSweeper):
+        async def _try_lock(self, session) -> bool:
+            return False
+
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    orphan = MedicalRecord.build_storage_uri(uuid.uuid4(), "b.pdf")
+    storage = ListingStorage({orphan: old})
+    sweeper = LockedOutSweeper(
+        storage=storage,
+        session_factory=get_async_session_maker(),
+        page_size=2,
+        min_age_seconds=3600,
+    )
+    before = metrics.snapshot()["counters"].get("storage.sweeper.skipped", 0)
+
+    assert asyncio.run(sweeper.sweep()) == 0
+    assert storage.list_calls == 0
+    assert set(storage.objects) == {orphan}
+    assert metrics.snapshot()["counters"]["storage.sweeper.skipped"] == before + 1
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from api.repositories.extracted_texts_repository import \
+    ExtractedTextsRepository
+from api.services import text_extraction_service
+from api.services.text_extraction_service import TextExtractionService
+from pypdf import PdfWriter
+from sqlalchemy.orm import Session
+from utils.metrics import metrics
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _blank_pdf(path: Path, pages: int) -> Path:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    writer.write(path)
+    return path
+
+
+def _service(page_parallelism: int = 4) -> TextExtractionService:
+    return TextExtractionService(
+        executor=ThreadPoolExecutor(max_workers=8),
+        page_parallelism=page_parallelism,
+    )
+
+
+def test_born_digital_pdf_is_never_rendered(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(*args, **kwargs):
+        raise AssertionError("page should not be rendered")
+
+    monkeypatch.setattr(text_extraction_service, "convert_from_path", _fail)
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+
+    result = asyncio.run(_service().extract(pdf_path))
+
+    assert result.text
+    assert result.rendered_pages == 0
+    assert result.skipped_pages == result.page_count == 1
+
+
+def test_scanned_pages_are_ocrd_in_parallel_and_kept_in_order(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    rendered: list[tuple[int, int]] = []
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def _convert(pdf_path, fmt, first_page, last_page):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            rendered.append((first_page, last_page))
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Later pages finish first to prove results are reassembled in order.
+        time.sleep(0.01 * (6 - first_page))
+        with lock:
+            in_flight -= 1
+        return [f"image-{first_page}"]
+
+    monkeypatch.setattr(text_extraction_service, "convert_from_path", _convert)
+    monkeypatch.setattr(
+        text_extraction_service, "image_to_string", lambda image: f"<{image}>"
+    )
+
+    result = asyncio.run(
+        _service(page_parallelism=2).extract(_blank_pdf(tmp_path / "scan.pdf", pages=5))
+    )
+
+    assert sorted(rendered) == [(page, page) for page in range(1, 6)]
+    assert result.text == "\f".join(f"<image-{page}>" for page in range(1, 6))
+    assert result.rendered_pages == 5
+    assert max_in_flight == 2
+
+
+def test_service_reports_rendered_and_skipped_pages() -> None:
+    pdf_path = next(DATA_DIR.glob("*.pdf"))
+    before = metrics.snapshot()["counters"].get("ocr.pages.skipped", 0)
+
+    text = asyncio.run(_service().extract_text_from_pdf(pdf_path))
+
+    assert text
+    assert metrics.snapshot()["counters"]["ocr.pages.skipped"] == before + 1
+
+
+def test_saving_text_already_stored_by_a_concurrent_upload_keeps_first(
+    db_session: Session,
+) -> None:
+    first = ExtractedTextsRepository(session=db_session)
+    # Both uploads missed the cache before either saved.
+    assert first.get_text("hash", "v1") is None
+    first.save_text("hash", "v1", "first")
+    ExtractedTextsRepository(session=db_session).save_text("hash", "v1", "second")
+
+    assert first.get_text("hash", "v1") == "first"
@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from utils.uploads import ArchiveTooLarge, spool_upload, spool_zip_members
+
+
+def test_spool_upload_hashes_while_copying_in_chunks(tmp_path: Path) -> None:
+    payload = b"%PDF-1.4 " + b"x" * 10_000
+    upload = UploadFile(file=io.BytesIO(payload), filename="record.pdf")
+
+    spooled = asyncio.run(
+        spool_upload(upload, directory=str(tmp_path), chunk_size=1024)
+    )
+
+    assert spooled.path.parent == tmp_path
+    assert spooled.path.read_bytes() == payload
+    assert spooled.size == len(payload)
+    assert spooled.content_hash == hashlib.sha256(payload).hexdigest()
+    spooled.cleanup()
+    assert not spooled.path.exists()
+
+
+def test_spool_zip_members_extracts_only_pdfs(tmp_path: Path) -> None:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("a/first.pdf", b"%PDF first")
+        zip_file.writestr("second.pdf", b"%PDF second")
+        zip_file.writestr("readme.txt", b"skip me")
+    upload = UploadFile(file=io.BytesIO(archive.getvalue()), filename="records.zip")
+
+    members = asyncio.run(spool_zip_members(upload, directory=str(tmp_path)))
+
+    assert [name for name, _ in members] == ["first.pdf", "second.pdf"]
+    assert members[0][1].path.read_bytes() == b"%PDF first"
+    assert members[1][1].content_hash == hashlib.sha256(b"%PDF second").hexdigest()
+    # Only the member spools remain; the archive itself was removed.
+    assert sorted(tmp_path.iterdir()) == sorted(upload.path for _, upload in members)
+
+
+def _zip_upload(members: dict[str, bytes]) -> UploadFile:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for name, payload in members.items():
+            zip_file.writestr(name, payload)
+    return UploadFile(file=io.BytesIO(archive.getvalue()), filename="records.zip")
+
+
+def test_spool_zip_members_rejects_too_many_pdfs_before_extracting(
+    tmp_path: Path,
+) -> None:
+    upload = _zip_upload({f"{index}.pdf": b"%PDF" for index in range(3)})
+
+    with pytest.raises(ArchiveTooLarge, match="more than 2 PDFs"):
+        asyncio.run(spool_zip_members(upload, directory=str(tmp_path), max_members=2))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "limits, message",
+    [
+        ({"max_member_bytes": 4096}, "PDF larger than 4096 bytes"),
+        ({"max_total_bytes": 15_000}, "more than 15000 bytes"),
+    ],
+)
+def test_spool_zip_members_caps_decompressed_bytes(
+    tmp_path: Path, limits: dict[str, int], message: str
+) -> None:
+    # Highly compressible members, as in a ZIP bomb.
+    upload = _zip_upload(
+        {
+            "small.pdf": b"\0" * 1000,
+            "first.pdf": b"\0" * 10_000,
+            "second.pdf": b"\0" * 10_000,
+        }
+    )
+
+    with pytest.raises(ArchiveTooLarge, match=message):
+        asyncio.run(
+            spool_zip_members(
+                upload, directory=str(tmp_path), chunk_size=1024, **limits
+            )
+        )
+    # Members spooled before the cap was hit are removed too.
+    assert list(tmp_path.iterdir()) == []
@@ -14,6 +14,8 @@ if str(ROOT_DIR) not in sys.path:
 from db.models.base import Base
 from db.models.event import Event  # noqa: F401
 from db.models.event_type import EventType  # noqa: F401
+from db.models.extracted_text import ExtractedText  # noqa: F401
+from db.models.extraction_result import ExtractionResult  # noqa: F401
 from db.models.medical_record import MedicalRecord  # noqa: F401
 from db.session_creator import get_db_uri
 
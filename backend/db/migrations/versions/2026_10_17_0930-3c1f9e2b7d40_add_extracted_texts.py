@@ -0,0 +1,45 @@
+"""Add extracted texts
+
+Revision ID: 3c1f9e2b7d40
+Revises: 8edd4c89e3b0
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f9e2b7d40"
+down_revision: Union[str, Sequence[str], None] = "8edd4c89e3b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "extracted_texts",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("extractor_version", sa.String(length=32), nullable=False),
+        sa.Column("compressed_text", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_time",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_time",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.PrimaryKeyConstraint("content_hash", "extractor_version"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("extracted_texts")
@@ -0,0 +1,54 @@
+"""Add extraction results
+
+Revision ID: 9b2d4e6f8a13
+Revises: 3c1f9e2b7d40
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2d4e6f8a13"
+down_revision: Union[str, Sequence[str], None] = "3c1f9e2b7d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "extraction_results",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("alerts", sa.Text(), nullable=False),
+        sa.Column("expires_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_time",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_time",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index(
+        op.f("ix_extraction_results_expires_time"),
+        "extraction_results",
+        ["expires_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_extraction_results_expires_time"), table_name="extraction_results"
+    )
+    op.drop_table("extraction_results")
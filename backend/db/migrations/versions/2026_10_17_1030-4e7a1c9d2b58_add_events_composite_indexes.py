@@ -0,0 +1,51 @@
+"""Add events composite indexes
+
+Revision ID: 4e7a1c9d2b58
+Revises: 9b2d4e6f8a13
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e7a1c9d2b58"
+down_revision: Union[str, Sequence[str], None] = "9b2d4e6f8a13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids blocking ingestion writes while the indexes build,
+    # but cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_date_id",
+            "events",
+            ["date", "id"],
+            unique=False,
+            postgresql_include=["event_type_id", "medical_record_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_events_event_type_id_date_id",
+            "events",
+            ["event_type_id", "date", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_events_event_type_id_date_id",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_events_date_id", table_name="events", postgresql_concurrently=True
+        )
@@ -0,0 +1,55 @@
+"""Add medical records listing indexes
+
+Revision ID: 6c3e8f1a9d27
+Revises: 4e7a1c9d2b58
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6c3e8f1a9d27"
+down_revision: Union[str, Sequence[str], None] = "4e7a1c9d2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY avoids blocking ingestion writes while the indexes build,
+    # but cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_medical_records_created_time_id",
+            "medical_records",
+            ["created_time", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_medical_records_filename_trgm",
+            "medical_records",
+            ["filename"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_medical_records_filename_trgm",
+            table_name="medical_records",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_medical_records_created_time_id",
+            table_name="medical_records",
+            postgresql_concurrently=True,
+        )
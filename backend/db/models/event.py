@@ -3,7 +3,7 @@ from datetime import date as Date
 from typing import TYPE_CHECKING
 
 from db.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,18 @@ if TYPE_CHECKING:
 
 class Event(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # GET /events: date range + ORDER BY (date, id) and the keyset seek.
+        # The INCLUDE columns let the filtered COUNT run as an index-only scan.
+        Index(
+            "ix_events_date_id",
+            "date",
+            "id",
+            postgresql_include=["event_type_id", "medical_record_id"],
+        ),
+        # Same query shape when filtered by event type.
+        Index("ix_events_event_type_id_date_id", "event_type_id", "date", "id"),
+    )
 
     medical_record_id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -0,0 +1,12 @@
+from db.models.base import Base, TimestampMixin
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ExtractedText(TimestampMixin, Base):
+    __tablename__ = "extracted_texts"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    extractor_version: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # zlib-compressed UTF-8 text produced by TextExtractionService
+    compressed_text: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
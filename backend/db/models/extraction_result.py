@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from db.models.base import Base, TimestampMixin
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ExtractionResult(TimestampMixin, Base):
+    __tablename__ = "extraction_results"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # JSON list of MedicalAlert payloads returned by the LLM
+    alerts: Mapped[str] = mapped_column(Text, nullable=False)
+    expires_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
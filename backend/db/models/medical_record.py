@@ -1,6 +1,8 @@
+import uuid
 from typing import TYPE_CHECKING
 
 from db.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -9,6 +11,18 @@ if TYPE_CHECKING:
 
 class MedicalRecord(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "medical_records"
+    __table_args__ = (
+        # GET /medical-records: ORDER BY (created_time, id) DESC and the keyset
+        # seek, read backwards.
+        Index("ix_medical_records_created_time_id", "created_time", "id"),
+        # Filename prefix and substring filters (LIKE / ILIKE) on Postgres.
+        Index(
+            "ix_medical_records_filename_trgm",
+            "filename",
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+        ),
+    )
 
     filename: Mapped[str] = mapped_column(nullable=False)
 
@@ -19,4 +33,16 @@ class MedicalRecord(UUIDPrimaryKeyMixin, TimestampMixin, Base):
 
     @property
     def storage_uri(self) -> str:
-        return f"{self.id}/{self.filename}"
+        return self.build_storage_uri(self.id, self.filename)
+
+    @staticmethod
+    def build_storage_uri(medical_record_id: uuid.UUID, filename: str) -> str:
+        return f"{medical_record_id}/{filename}"
+
+    @staticmethod
+    def parse_storage_uri(storage_uri: str) -> uuid.UUID | None:
+        """Return the medical record id a storage key belongs to, if any."""
+        try:
+            return uuid.UUID(storage_uri.split("/", 1)[0])
+        except ValueError:
+            return None
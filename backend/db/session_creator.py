@@ -1,47 +1,270 @@
 import os
 import sys
+import tempfile
+import threading
+import time
 from typing import Any
 
 from db.models.base import Base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
+                                    async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import (AsyncAdaptedQueuePool, ConnectionPoolEntry,
+                             NullPool, Pool, QueuePool, StaticPool)
+from utils.metrics import metrics
 from utils.settings import AppSettings
 
+POOL_CHECKOUT_WAIT_METRIC = "db.pool.checkout_wait"
+ASYNC_POOL_CHECKOUT_WAIT_METRIC = "db.async_pool.checkout_wait"
+
+_engines: dict[str, Engine] = {}
+_session_makers: dict[str, sessionmaker[Session]] = {}
+_async_engines: dict[str, AsyncEngine] = {}
+_async_session_makers: dict[str, async_sessionmaker[AsyncSession]] = {}
+_registry_lock = threading.Lock()
+
+# The sync and async engines hold separate connections, so tests share a file
+# instead of an in-memory database.
+TEST_DB_PATH = os.path.join(tempfile.gettempdir(), f"api-tests-{os.getpid()}.sqlite3")
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
 def get_db_uri() -> str:
     _settings = AppSettings()
     if "pytest" in sys.modules:
-        return "sqlite+pysqlite:///:memory:"
+        return f"sqlite+pysqlite:///{TEST_DB_PATH}"
     return f"postgresql+psycopg2://{_settings.PGUSER}:{_settings.PGPASSWORD}@{_settings.PGHOST}:{_settings.PGPORT}/{_settings.PGDATABASE}"
 
 
-def get_db_session(
+def to_async_db_uri(postgres_url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart."""
+    url = make_url(postgres_url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_db_uri() -> str:
+    return to_async_db_uri(get_db_uri())
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    checkout_wait_metric = POOL_CHECKOUT_WAIT_METRIC
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(self.checkout_wait_metric, time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for engines created with `create_async_engine`."""
+
+    checkout_wait_metric = ASYNC_POOL_CHECKOUT_WAIT_METRIC
+
+
+def create_db_engine(
     postgres_url: str = get_db_uri(),
     echo: bool = False,
     pool_size: int | None = None,
-    create_metadata: bool = False,
+    max_overflow: int = 20,
+    pool_recycle: int = 1800,
+    pool_timeout: int = 30,
     **kwargs: Any,
-) -> Session:
+) -> Engine:
     os.environ["SQLALCHEMY_WARN_20"] = "true"
     is_sqlite = postgres_url.startswith("sqlite")
     if is_sqlite:
         kwargs.setdefault("connect_args", {})
         kwargs["connect_args"].setdefault("check_same_thread", False)
-        kwargs.setdefault("poolclass", StaticPool)
+        # An in-memory database lives and dies with its connection, so it has
+        # to be shared. File databases get one connection per session: sessions
+        # used from worker threads at the same time must not share a
+        # connection (and its transaction).
+        in_memory = make_url(postgres_url).database in (None, "", ":memory:")
+        kwargs.setdefault("poolclass", StaticPool if in_memory else NullPool)
         pool_size = None
     if pool_size:
+        kwargs.setdefault("poolclass", InstrumentedQueuePool)
         kwargs["pool_size"] = pool_size
-        kwargs["max_overflow"] = 20
-        kwargs["pool_recycle"] = 1800
-        kwargs["pool_timeout"] = 30
+        kwargs["max_overflow"] = max_overflow
+        kwargs["pool_recycle"] = pool_recycle
+        kwargs["pool_timeout"] = pool_timeout
 
-    engine = create_engine(
+    return create_engine(
         postgres_url, pool_pre_ping=not is_sqlite, future=True, echo=echo, **kwargs
     )
+
+
+def init_engine(
+    postgres_url: str = get_db_uri(),
+    create_metadata: bool = False,
+    **kwargs: Any,
+) -> Engine:
+    """Create the process-wide engine for `postgres_url` once and reuse it.
+
+    Engine options only apply on the first call for a given URL; later calls
+    return the already registered engine so every request shares one pool.
+    """
+    with _registry_lock:
+        engine = _engines.get(postgres_url)
+        if engine is None:
+            engine = create_db_engine(postgres_url, **kwargs)
+            _engines[postgres_url] = engine
+            _session_makers[postgres_url] = sessionmaker(
+                bind=engine, autoflush=False, autocommit=False, future=True
+            )
     if create_metadata:
         Base.metadata.create_all(bind=engine)
-    session_maker = sessionmaker(
-        bind=engine, autoflush=False, autocommit=False, future=True
+    return engine
+
+
+def get_engine(postgres_url: str = get_db_uri()) -> Engine:
+    engine = _engines.get(postgres_url)
+    if engine is not None:
+        return engine
+    _settings = AppSettings()
+    return init_engine(
+        postgres_url,
+        pool_size=_settings.DB_POOL_SIZE,
+        max_overflow=_settings.DB_MAX_OVERFLOW,
+        pool_recycle=_settings.DB_POOL_RECYCLE,
+        pool_timeout=_settings.DB_POOL_TIMEOUT,
     )
-    return session_maker()
+
+
+def get_session_maker(postgres_url: str = get_db_uri()) -> sessionmaker[Session]:
+    get_engine(postgres_url)
+    return _session_makers[postgres_url]
+
+
+def dispose_engines() -> None:
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _session_makers.clear()
+
+
+def get_pool_stats(postgres_url: str = get_db_uri()) -> dict[str, Any]:
+    """Usage of the sync and async engine pools, each with its checkout waits."""
+    return {
+        "sync": _pool_stats(get_engine(postgres_url).pool, POOL_CHECKOUT_WAIT_METRIC),
+        "async": _pool_stats(
+            get_async_engine(to_async_db_uri(postgres_url)).pool,
+            ASYNC_POOL_CHECKOUT_WAIT_METRIC,
+        ),
+    }
+
+
+def _pool_stats(pool: Pool, checkout_wait_metric: str) -> dict[str, Any]:
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    stats["checkout_wait"] = metrics.timing(checkout_wait_metric).snapshot()
+    return stats
+
+
+def get_db_session(
+    postgres_url: str = get_db_uri(),
+    echo: bool = False,
+    pool_size: int | None = None,
+    create_metadata: bool = False,
+    **kwargs: Any,
+) -> Session:
+    init_engine(
+        postgres_url,
+        create_metadata=create_metadata,
+        echo=echo,
+        pool_size=pool_size,
+        **kwargs,
+    )
+    return _session_makers[postgres_url]()
+
+
+def create_async_db_engine(
+    postgres_url: str = get_async_db_uri(),
+    echo: bool = False,
+    pool_size: int | None = None,
+    max_overflow: int = 20,
+    pool_recycle: int = 1800,
+    pool_timeout: int = 30,
+    **kwargs: Any,
+) -> AsyncEngine:
+    is_sqlite = postgres_url.startswith("sqlite")
+    if is_sqlite:
+        # aiosqlite connections are cheap to open, and a pooled one would be
+        # reused across the event loops of separate test clients.
+        kwargs.setdefault("poolclass", NullPool)
+        pool_size = None
+    if pool_size:
+        kwargs.setdefault("poolclass", InstrumentedAsyncQueuePool)
+        kwargs["pool_size"] = pool_size
+        kwargs["max_overflow"] = max_overflow
+        kwargs["pool_recycle"] = pool_recycle
+        kwargs["pool_timeout"] = pool_timeout
+
+    return create_async_engine(
+        postgres_url, pool_pre_ping=not is_sqlite, echo=echo, **kwargs
+    )
+
+
+def init_async_engine(
+    postgres_url: str = get_async_db_uri(),
+    **kwargs: Any,
+) -> AsyncEngine:
+    """Async counterpart of `init_engine`: one engine and pool per URL."""
+    with _registry_lock:
+        engine = _async_engines.get(postgres_url)
+        if engine is None:
+            engine = create_async_db_engine(postgres_url, **kwargs)
+            _async_engines[postgres_url] = engine
+            _async_session_makers[postgres_url] = async_sessionmaker(
+                bind=engine, autoflush=False, expire_on_commit=False
+            )
+    return engine
+
+
+def get_async_engine(postgres_url: str = get_async_db_uri()) -> AsyncEngine:
+    engine = _async_engines.get(postgres_url)
+    if engine is not None:
+        return engine
+    _settings = AppSettings()
+    return init_async_engine(
+        postgres_url,
+        pool_size=_settings.DB_POOL_SIZE,
+        max_overflow=_settings.DB_MAX_OVERFLOW,
+        pool_recycle=_settings.DB_POOL_RECYCLE,
+        pool_timeout=_settings.DB_POOL_TIMEOUT,
+    )
+
+
+def get_async_session_maker(
+    postgres_url: str = get_async_db_uri(),
+) -> async_sessionmaker[AsyncSession]:
+    get_async_engine(postgres_url)
+    return _async_session_makers[postgres_url]
+
+
+async def dispose_async_engines() -> None:
+    with _registry_lock:
+        engines = list(_async_engines.values())
+        _async_engines.clear()
+        _async_session_makers.clear()
+    for engine in engines:
+        await engine.dispose()
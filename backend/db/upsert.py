@@ -0,0 +1,19 @@
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(session: Session, model: Any) -> Any:
+    """Return the dialect's INSERT for `model`, which supports ON CONFLICT.
+
+    Both supported dialects provide `on_conflict_do_nothing` and
+    `on_conflict_do_update`, so a concurrent writer of the same key never
+    turns into an IntegrityError.
+    """
+    return _INSERTS[session.get_bind().dialect.name](model)
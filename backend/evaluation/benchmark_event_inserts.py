@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from api.repositories.medical_records_repository import \
+    insert_medical_record  # noqa: E402
+from db.models.base import Base  # noqa: E402
+from db.models.event import Event  # noqa: E402
+from db.models.event_type import EventType  # noqa: E402
+from db.models.medical_record import MedicalRecord  # noqa: E402
+from db.session_creator import create_db_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+EVENT_TYPE_ID = "benchmark"
+
+
+def _event_rows(medical_record_id: uuid.UUID, count: int) -> list[dict[str, Any]]:
+    start = date(2030, 1, 1)
+    return [
+        {
+            "medical_record_id": medical_record_id,
+            "event_type_id": EVENT_TYPE_ID,
+            "event": f"Benchmark event {i}",
+            "date": start + timedelta(days=i % 365),
+        }
+        for i in range(count)
+    ]
+
+
+def save_with_orm(session: Session, events_per_record: int) -> None:
+    medical_record = MedicalRecord(id=uuid.uuid4(), filename="benchmark.pdf")
+    session.add(medical_record)
+    session.add_all(
+        Event(**row) for row in _event_rows(medical_record.id, events_per_record)
+    )
+    session.commit()
+
+
+def save_with_bulk_insert(session: Session, events_per_record: int) -> None:
+    medical_record = MedicalRecord(id=uuid.uuid4(), filename="benchmark.pdf")
+    insert_medical_record(
+        session, medical_record, _event_rows(medical_record.id, events_per_record)
+    )
+
+
+def run_benchmark(
+    database_url: str, records: int, events_per_record: int
+) -> dict[str, Any]:
+    engine = create_db_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    with session_factory() as session:
+        if session.get(EventType, EVENT_TYPE_ID) is None:
+            session.add(
+                EventType(
+                    id=EVENT_TYPE_ID,
+                    name="BENCHMARK",
+                    description="Rows written by the insert benchmark",
+                    is_deletable=True,
+                )
+            )
+            session.commit()
+
+    strategies: dict[str, Callable[[Session, int], None]] = {
+        "orm_add_all": save_with_orm,
+        "bulk_insert": save_with_bulk_insert,
+    }
+    results: dict[str, Any] = {}
+    for name, save in strategies.items():
+        with session_factory() as session:
+            started = time.perf_counter()
+            for _ in range(records):
+                save(session, events_per_record)
+            elapsed = time.perf_counter() - started
+        total_events = records * events_per_record
+        results[name] = {
+            "seconds": round(elapsed, 3),
+            "events_per_second": round(total_events / elapsed),
+        }
+    results["speedup"] = round(
+        results["bulk_insert"]["events_per_second"]
+        / results["orm_add_all"]["events_per_second"],
+        2,
+    )
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare ORM add_all with bulk INSERTs for extracted events."
+    )
+    parser.add_argument(
+        "--database-url",
+        default="sqlite+pysqlite:///:memory:",
+        help="SQLAlchemy URL; point it at a scratch Postgres database for real numbers.",
+    )
+    parser.add_argument("--records", type=int, default=50)
+    parser.add_argument("--events-per-record", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.database_url, args.records, args.events_per_record)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class TimingStat:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": self.total_seconds,
+                "avg_seconds": self.total_seconds / self.count if self.count else 0.0,
+                "max_seconds": self.max_seconds,
+            }
+
+
+class Metrics:
+    """Process-wide counters and timings, exposed through `GET /metrics`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._timings: dict[str, TimingStat] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def timing(self, name: str) -> TimingStat:
+        with self._lock:
+            stat = self._timings.get(name)
+            if stat is None:
+                stat = self._timings[name] = TimingStat()
+            return stat
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.timing(name).observe(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            timings = dict(self._timings)
+        return {
+            "counters": counters,
+            "timings": {name: stat.snapshot() for name, stat in timings.items()},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
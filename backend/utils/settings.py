@@ -20,7 +20,62 @@ class AppSettings(BaseSettings):
     PGPASSWORD: str = Field()
     PGDATABASE: str = Field()
 
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    DB_POOL_TIMEOUT: int = Field(default=30)
+
+    INGESTION_MAX_CONCURRENT_JOBS: int = Field(default=4)
+    OCR_MAX_WORKERS: int | None = Field(default=None)
+    OCR_PAGE_PARALLELISM: int = Field(default=4)
+
+    LLM_MAX_CONCURRENCY: int = Field(default=8)
+    # Requests and tokens per minute for each client defined in clients.baml
+    LLM_RATE_LIMITS: dict[str, dict[str, int]] = Field(
+        default={
+            "OpenAIResponsesStable": {"rpm": 500, "tpm": 200_000},
+            "OpenAIChatReliable": {"rpm": 500, "tpm": 30_000},
+        }
+    )
+    LLM_CHUNK_MAX_TOKENS: int = Field(default=8_000)
+    LLM_CHUNK_OVERLAP_TOKENS: int = Field(default=200)
+
+    EXTRACTION_CACHE_MAX_ENTRIES: int = Field(default=1024)
+    EXTRACTION_CACHE_TTL_SECONDS: int = Field(default=30 * 24 * 60 * 60)
+    # Invalidation only clears the calling worker's in-memory tier, so other
+    # workers may serve stale results for up to this long
+    EXTRACTION_CACHE_MEMORY_TTL_SECONDS: int = Field(default=300)
+    # Minimum time between purges of expired durable entries, run on write
+    EXTRACTION_CACHE_PURGE_INTERVAL_SECONDS: int = Field(default=60 * 60)
+
+    EVENT_TYPES_CACHE_TTL_SECONDS: int = Field(default=300)
+
+    EVENTS_COUNT_CACHE_MAX_ENTRIES: int = Field(default=1024)
+    EVENTS_COUNT_CACHE_TTL_SECONDS: int = Field(default=30)
+    # Unfiltered totals above this many rows use the planner's estimate
+    EVENTS_COUNT_ESTIMATE_MIN_ROWS: int = Field(default=100_000)
+    # Events removed per statement (and transaction) when deleting a whole
+    # event type or medical record
+    EVENTS_DELETE_BATCH_SIZE: int = Field(default=5000)
+
+    UPLOAD_SPOOL_DIR: str | None = Field(default=None)
+    BATCH_MAX_FILES: int = Field(default=1000)
+    # Decompressed size caps for PDFs extracted from a batch's ZIP archives
+    BATCH_MAX_ZIP_MEMBER_BYTES: int = Field(default=100 * 1024 * 1024)
+    BATCH_MAX_ZIP_TOTAL_BYTES: int = Field(default=2 * 1024 * 1024 * 1024)
+
+    # Deleted medical records are removed from the database this many at a time
+    MEDICAL_RECORDS_DELETE_BATCH_SIZE: int = Field(default=500)
+    # Garbage collection of stored PDFs without a medical record; 0 disables it.
+    # Objects younger than the minimum age may belong to an upload in progress.
+    STORAGE_SWEEP_INTERVAL_SECONDS: int = Field(default=3600)
+    STORAGE_SWEEP_PAGE_SIZE: int = Field(default=1000)
+    STORAGE_SWEEP_MIN_AGE_SECONDS: int = Field(default=3600)
+
     MINIO_ENDPOINT: str = Field(default="minio:9000")
     MINIO_ROOT_USER: str = Field()
     MINIO_ROOT_PASSWORD: str = Field()
     MINIO_BUCKET: str = Field(default="docs")
+    MINIO_MAX_POOL_CONNECTIONS: int = Field(default=20)
+    MINIO_CONNECT_TIMEOUT_SECONDS: float = Field(default=5)
+    MINIO_READ_TIMEOUT_SECONDS: float = Field(default=300)
@@ -1,35 +1,141 @@
-import io
+import itertools
+import threading
+import traceback
+from collections.abc import Iterable
+from pathlib import Path
 
+import urllib3
 from minio import Minio
+from minio.datatypes import Object
+from minio.deleteobjects import DeleteObject
+from utils.metrics import metrics
 from utils.settings import AppSettings
 
+_storage: "MinioClient | None" = None
+_storage_lock = threading.Lock()
+
 
 class MinioClient:
-    def __init__(self, client: Minio, bucket: str):
+    def __init__(
+        self,
+        client: Minio,
+        bucket: str,
+        http_client: urllib3.PoolManager | None = None,
+    ):
         self.client = client
         self.bucket = bucket
-        found = self.client.bucket_exists(bucket)
-        if not found:
-            self.client.make_bucket(bucket)
+        self.http_client = http_client
+        self._bucket_ready = False
+        self._bucket_lock = threading.Lock()
 
     @classmethod
     def from_env(cls, settings: AppSettings):
-        print("creating minio client", flush=True)
+        # One pool shared by every request; sized so concurrent uploads do not
+        # queue for a connection or open throwaway ones.
+        http_client = urllib3.PoolManager(
+            maxsize=settings.MINIO_MAX_POOL_CONNECTIONS,
+            block=False,
+            timeout=urllib3.Timeout(
+                connect=settings.MINIO_CONNECT_TIMEOUT_SECONDS,
+                read=settings.MINIO_READ_TIMEOUT_SECONDS,
+            ),
+            retries=urllib3.Retry(
+                total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+            ),
+        )
         m = Minio(
             settings.MINIO_ENDPOINT,
             access_key=settings.MINIO_ROOT_USER,
             secret_key=settings.MINIO_ROOT_PASSWORD,
             secure=False,
+            http_client=http_client,
         )
-        return cls(m, settings.MINIO_BUCKET)
+        return cls(m, settings.MINIO_BUCKET, http_client=http_client)
 
-    def put_file(
-        self, key: str, data: bytes, content_type: str = "application/octet-stream"
+    def ensure_bucket(self) -> None:
+        """Create the bucket if needed; only the first successful call hits MinIO."""
+        if self._bucket_ready:
+            return
+        with self._bucket_lock:
+            if self._bucket_ready:
+                return
+            if not self.client.bucket_exists(self.bucket):
+                self.client.make_bucket(self.bucket)
+            self._bucket_ready = True
+
+    def put_path(
+        self, key: str, path: Path, content_type: str = "application/octet-stream"
     ) -> None:
-        self.client.put_object(
-            self.bucket,
-            key,
-            io.BytesIO(data),
-            length=len(data),
-            content_type=content_type,
+        self.ensure_bucket()
+        with metrics.timed("storage.put_path"):
+            # fput_object streams the file from disk in multipart chunks.
+            self.client.fput_object(
+                self.bucket, key, str(path), content_type=content_type
+            )
+
+    def remove_object(self, key: str) -> None:
+        self.client.remove_object(self.bucket, key)
+
+    def remove_objects(self, keys: Iterable[str]) -> list[str]:
+        """Remove `keys` with multi-object deletes and return the keys that failed.
+
+        The client sends up to 1000 keys per request.
+        """
+        with metrics.timed("storage.remove_objects"):
+            errors = self.client.remove_objects(
+                self.bucket, (DeleteObject(key) for key in keys)
+            )
+            # The deletes are only sent while the error iterator is consumed.
+            failed = [error.name for error in errors if error.name]
+        if failed:
+            metrics.increment("storage.remove_objects.failed", len(failed))
+        return failed
+
+    def list_objects(
+        self, start_after: str | None = None, limit: int = 1000
+    ) -> list[Object]:
+        """Return up to `limit` objects in key order, after `start_after`."""
+        return list(
+            itertools.islice(
+                self.client.list_objects(
+                    self.bucket, recursive=True, start_after=start_after
+                ),
+                limit,
+            )
         )
+
+    def close(self) -> None:
+        if self.http_client is not None:
+            self.http_client.clear()
+
+
+def init_storage(settings: AppSettings) -> MinioClient:
+    """Create the process-wide storage client once and check its bucket.
+
+    A failed bucket check is not fatal at startup (MinIO may still be booting);
+    it is retried before the first upload instead.
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = MinioClient.from_env(settings)
+        storage = _storage
+    try:
+        storage.ensure_bucket()
+    except Exception:
+        traceback.print_exc()
+    return storage
+
+
+def get_storage_client(settings: AppSettings) -> MinioClient:
+    with _storage_lock:
+        storage = _storage
+    return storage or init_storage(settings)
+
+
+def close_storage() -> None:
+    global _storage
+    with _storage_lock:
+        storage, _storage = _storage, None
+    if storage is not None:
+        storage.close()
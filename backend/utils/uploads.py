@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file copied to disk, with its size and SHA-256 digest."""
+
+    path: Path
+    size: int
+    content_hash: str
+
+    def cleanup(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class ArchiveTooLarge(ValueError):
+    """Raised when a ZIP upload exceeds a member count or decompressed size cap."""
+
+
+async def spool_upload(
+    file: UploadFile,
+    directory: str | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    suffix: str = ".pdf",
+) -> SpooledUpload:
+    """Copy `file` to a named temporary file chunk by chunk, hashing as it goes.
+
+    Only one chunk is held in memory at a time, and the extraction and storage
+    stages can work from the resulting path instead of a bytes copy.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, name = tempfile.mkstemp(suffix=suffix, dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while chunk := await file.read(chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                await run_in_threadpool(spool.write, chunk)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=Path(name), size=size, content_hash=digest.hexdigest())
+
+
+async def spool_zip_members(
+    file: UploadFile,
+    directory: str | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_members: int | None = None,
+    max_member_bytes: int | None = None,
+    max_total_bytes: int | None = None,
+) -> list[tuple[str, SpooledUpload]]:
+    """Spool every PDF inside a ZIP upload to its own temporary file.
+
+    Returns `(member filename, upload)` pairs. Raises `zipfile.BadZipFile` when
+    the upload is not a readable archive, and `ArchiveTooLarge` when it holds
+    more than `max_members` PDFs or a PDF decompresses past `max_member_bytes`
+    or all of them past `max_total_bytes`. Sizes are counted while streaming,
+    since the sizes in the archive's directory can be forged.
+    """
+    archive = await spool_upload(
+        file, directory=directory, chunk_size=chunk_size, suffix=".zip"
+    )
+    try:
+        return await run_in_threadpool(
+            _spool_pdf_members,
+            archive.path,
+            directory,
+            chunk_size,
+            max_members,
+            max_member_bytes,
+            max_total_bytes,
+        )
+    finally:
+        archive.cleanup()
+
+
+def _spool_pdf_members(
+    archive_path: Path,
+    directory: str | None,
+    chunk_size: int,
+    max_members: int | None,
+    max_member_bytes: int | None,
+    max_total_bytes: int | None,
+) -> list[tuple[str, SpooledUpload]]:
+    uploads: list[tuple[str, SpooledUpload]] = []
+    total_bytes = 0
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [info for info in archive.infolist() if _is_pdf_member(info)]
+            # Checked before anything is extracted.
+            if max_members is not None and len(members) > max_members:
+                raise ArchiveTooLarge(f"contains more than {max_members} PDFs")
+            for info in members:
+                limit = max_member_bytes
+                if max_total_bytes is not None:
+                    remaining = max_total_bytes - total_bytes
+                    limit = remaining if limit is None else min(limit, remaining)
+                with archive.open(info) as source:
+                    upload = _spool_stream(source, directory, chunk_size, limit)
+                if upload is None:
+                    if limit == max_member_bytes:
+                        raise ArchiveTooLarge(
+                            f"contains a PDF larger than {max_member_bytes} bytes"
+                        )
+                    raise ArchiveTooLarge(
+                        f"decompresses to more than {max_total_bytes} bytes"
+                    )
+                total_bytes += upload.size
+                uploads.append((PurePosixPath(info.filename).name, upload))
+    except BaseException:
+        for _, upload in uploads:
+            upload.cleanup()
+        raise
+    return uploads
+
+
+def _is_pdf_member(info: zipfile.ZipInfo) -> bool:
+    member = PurePosixPath(info.filename)
+    return not (
+        info.is_dir()
+        or not member.name.endswith(".pdf")
+        or member.name.startswith(".")
+        or "__MACOSX" in member.parts
+    )
+
+
+def _spool_stream(
+    source, directory: str | None, chunk_size: int, max_bytes: int | None = None
+) -> SpooledUpload | None:
+    """Spool `source` to a temporary file, or return None past `max_bytes`."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, name = tempfile.mkstemp(suffix=".pdf", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    Path(name).unlink(missing_ok=True)
+                    return None
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=Path(name), size=size, content_hash=digest.hexdigest())
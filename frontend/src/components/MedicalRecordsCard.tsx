@@ -2,6 +2,7 @@ import { useCallback, useContext, useEffect, useRef, useState } from "react";
 import type { ChangeEvent, MouseEvent } from "react";
 import {
   Box,
+  Button,
   Card,
   CardContent,
   CardHeader,
@@ -48,6 +49,8 @@ export default function MedicalRecordsCard({
   const { medicalRecords: medicalRecordsService } = useContext(ApiContext);
   const [records, setRecords] = useState<MedicalRecord[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const fileInputRef = useRef<HTMLInputElement | null>(null);
   const [menuAnchorEl, setMenuAnchorEl] = useState<HTMLElement | null>(null);
   const [menuRecord, setMenuRecord] = useState<MedicalRecord | null>(null);
@@ -58,8 +61,9 @@ export default function MedicalRecordsCard({
   const loadMedicalRecords = useCallback(async () => {
     setLoading(true);
     try {
-      const fetchedRecords = await medicalRecordsService.list();
-      setRecords(fetchedRecords);
+      const response = await medicalRecordsService.list();
+      setRecords(response.medical_records ?? []);
+      setNextCursor(response.next_cursor ?? null);
     } catch (error) {
       console.error(error);
       showSnackbar((error as Error).message, "error");
@@ -68,6 +72,21 @@ export default function MedicalRecordsCard({
     }
   }, [medicalRecordsService]);
 
+  const loadMoreMedicalRecords = useCallback(async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await medicalRecordsService.list(nextCursor);
+      setRecords((prev) => [...prev, ...(response.medical_records ?? [])]);
+      setNextCursor(response.next_cursor ?? null);
+    } catch (error) {
+      console.error(error);
+      showSnackbar((error as Error).message, "error");
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [medicalRecordsService, nextCursor]);
+
   const hasLoadedRef = useRef(false);
 
   useEffect(() => {
@@ -207,7 +226,7 @@ export default function MedicalRecordsCard({
                   <InsertDriveFileIcon color="primary" sx={{ mr: 1 }} />
                   <ListItemText
                     primary={record.filename}
-                    secondary={`Uploaded ${format(record.created_time)}`}
+                    secondary={`Uploaded ${format(record.created_time)} · ${record.event_count} alert${record.event_count === 1 ? "" : "s"}`}
                     primaryTypographyProps={{
                       noWrap: true,
                       sx: {
@@ -242,6 +261,17 @@ export default function MedicalRecordsCard({
                 No patient files uploaded yet.
               </Typography>
             )}
+            {nextCursor && (
+              <Box sx={{ display: "flex", justifyContent: "center", pt: 1 }}>
+                <Button
+                  size="small"
+                  onClick={() => void loadMoreMedicalRecords()}
+                  disabled={disabled || loadingMore}
+                >
+                  {loadingMore ? "Loading…" : "Load more"}
+                </Button>
+              </Box>
+            )}
           </List>
         )}
         <Menu
@@ -1,16 +1,21 @@
 import httpClient from "../api/client";
-import type { MedicalRecord, MedicalRecordsResponse } from "../types";
+import type { MedicalRecordsResponse } from "../types";
+
+export const MEDICAL_RECORDS_PAGE_SIZE = 50;
 
 export interface MedicalRecordsServiceProps {
-  list: () => Promise<MedicalRecord[]>;
+  list: (cursor?: string | null) => Promise<MedicalRecordsResponse>;
   upload: (file: File) => Promise<void>;
   remove: (id: string) => Promise<void>;
 }
 
 export function MedicalRecordsService() : MedicalRecordsServiceProps {
-  const list = async (): Promise<MedicalRecord[]> => {
-    const response = await httpClient.get<MedicalRecordsResponse>("/medical-records");
-    return response.data.medical_records ?? [];
+  // Returns one page; pass its `next_cursor` back to fetch the following one.
+  const list = async (cursor?: string | null): Promise<MedicalRecordsResponse> => {
+    const response = await httpClient.get<MedicalRecordsResponse>("/medical-records", {
+      params: { page_size: MEDICAL_RECORDS_PAGE_SIZE, cursor: cursor ?? undefined },
+    });
+    return response.data;
   }
   const upload = async (file: File): Promise<void> => {
     const formData = new FormData();
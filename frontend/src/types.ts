@@ -17,16 +17,21 @@ export interface EventsResponse {
   total?: number;
   page?: number;
   page_size?: number;
+  total_is_exact?: boolean | null;
+  next_cursor?: string | null;
 }
 
 export interface MedicalRecord {
   id: string;
   filename: string;
   created_time: string;
+  event_count: number;
 }
 
 export interface MedicalRecordsResponse {
   medical_records?: MedicalRecord[];
+  page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface FiltersState {